@@ -1,2 +1,4 @@
 from .game import analyze_game
-from .hand import create_hand_histogram
+from .hand import create_hand_histogram, HandHistogram
+from .online import GameAnalyzer, RunningStats
+from .sequential import StoppingRule, WinRateInterval, SPRT
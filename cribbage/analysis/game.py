@@ -1,7 +1,26 @@
 import pandas as pd
 import numpy as np
 
-from cribbage.constants import TURNS, CRIB, WINNER
+from cribbage.constants import TURNS, CRIB, WINNER, PAIR
+
+# Columns added by analyze_game for duplicate games, filled in on the total row
+PAIRED_COLUMNS = ['paired_win_rate', 'paired_win_rate_error', 'paired_point_margin', 'paired_point_margin_error']
+
+def paired_differences(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Takes duplicate games (with a pair column) and returns strat1's share of
+    the wins and average point margin over each complete pair. Both games of
+    a pair have the same cards, so these vary much less than single games.
+    """
+    games = pd.DataFrame({
+        'win': df[f'strat1_{WINNER}'].astype(float),
+        'margin': (df['strat1_total_points'] - df['strat2_total_points']).astype(float),
+        PAIR: df[PAIR],
+    }).groupby(PAIR)
+    return games.mean()[games.size() == 2]
+
+def paired_columns(mean_win: float, error_win: float, mean_margin: float, error_margin: float) -> pd.Series:
+    return pd.Series(dict(zip(PAIRED_COLUMNS, (mean_win, error_win, mean_margin, error_margin))))
 
 def analyze_game(df: pd.DataFrame):
     """
@@ -15,6 +34,9 @@ def analyze_game(df: pd.DataFrame):
             player
       - strat(1|2)_(hand|crib|peg)_points_pct: percentage of points (relative
             to total) coming from each game section
+    Duplicate games (see simulate) also get strat1's mean share of the wins
+    and point margin over pairs of games, with their standard errors, on the
+    total row: paired_win_rate(_error) and paired_point_margin(_error).
     """
     rows = (
         ('total', np.repeat(True, len(df.index))),
@@ -38,5 +60,13 @@ def analyze_game(df: pd.DataFrame):
             'strat1_crib_points': (_df['strat1_crib_points'] / _df['strat1_total_points']).mean(),
             'strat2_crib_points': (_df['strat2_crib_points'] / _df['strat2_total_points']).mean(),
         }, name=row_name)
-    return pd.DataFrame(_analyze(row_name, mask) for row_name, mask in rows)
+    analysis = pd.DataFrame(_analyze(row_name, mask) for row_name, mask in rows)
+    if PAIR in df.columns:
+        pairs = paired_differences(df)
+        errors = pairs.std() / np.sqrt(len(pairs.index))
+        paired = paired_columns(pairs['win'].mean(), errors['win'], pairs['margin'].mean(), errors['margin'])
+        for column, value in paired.items():
+            analysis[column] = np.nan
+            analysis.loc['total', column] = value
+    return analysis
 
@@ -1,32 +1,56 @@
 import pandas as pd
+import numpy as np
 
-def create_hand_histogram(raw_data: pd.DataFrame) -> pd.DataFrame:
-    # Crib hands can have anywhere between 0 and 29 points
-    crib_score_data = {
-        'crib': [0 for i in range(30)],
-        'not-crib': [0 for i in range(30)]
-    }
+# Crib hands can have anywhere between 0 and 29 points
+SCORES = 30
+
+class HandHistogram:
+    """
+    HandHistogram counts hand scores for crib and non-crib hands. It can be
+    updated chunk by chunk and merged with other histograms. Since scores are
+    small integers, the means and standard deviations are computed exactly
+    from the counts. Raw data with a weight column counts each row that
+    many times.
+    """
+    def __init__(self):
+        self.counts = {
+            'crib': np.zeros(SCORES, dtype=np.int64),
+            'not-crib': np.zeros(SCORES, dtype=np.int64),
+        }
 
-    for _, row in raw_data.iterrows():
-        if row['crib']:
-            crib_score_data['crib'][row['score']] += 1
+    def update(self, raw_data: pd.DataFrame) -> 'HandHistogram':
+        crib = raw_data['crib'].values.astype(bool)
+        score = raw_data['score'].values
+        if 'weight' in raw_data.columns:
+            weight = raw_data['weight'].values
+            self.counts['crib'] += np.bincount(score[crib], weight[crib], SCORES).astype(np.int64)
+            self.counts['not-crib'] += np.bincount(score[~crib], weight[~crib], SCORES).astype(np.int64)
         else:
-            crib_score_data['not-crib'][row['score']] += 1
-    
-    crib_score_data['total'] = [x + y for x,y in zip(crib_score_data['crib'], crib_score_data['not-crib'])]
-    
-    for section, data in (
-        ('crib', raw_data[raw_data['crib'] == 1]),
-        ('not-crib', raw_data[raw_data['crib'] == 0]),
-        ('total', raw_data)
-    ):
-        crib_score_data[section].extend((data['score'].mean(), data['score'].std()))
+            self.counts['crib'] += np.bincount(score[crib], minlength=SCORES)
+            self.counts['not-crib'] += np.bincount(score[~crib], minlength=SCORES)
+        return self
+
+    def merge(self, other: 'HandHistogram') -> 'HandHistogram':
+        for section in self.counts:
+            self.counts[section] += other.counts[section]
+        return self
 
+    def result(self) -> pd.DataFrame:
+        counts = {**self.counts, 'total': self.counts['crib'] + self.counts['not-crib']}
+        def _row(counts: np.ndarray) -> list:
+            n = counts.sum()
+            scores = np.arange(len(counts))
+            mean = (scores * counts).sum() / n if n else np.nan
+            stddev = np.sqrt(((scores - mean) ** 2 * counts).sum() / (n - 1)) if n > 1 else np.nan
+            return counts.tolist() + [mean, stddev]
 
-    columns = [str(x) for x in range(30)] + ['mean', 'stddev']
-    index = ['total', 'crib', 'not-crib']
-    return pd.DataFrame(
-        [crib_score_data[name] for name in index],
-        columns=columns,
-        index=index
-    )
+        columns = [str(x) for x in range(SCORES)] + ['mean', 'stddev']
+        index = ['total', 'crib', 'not-crib']
+        return pd.DataFrame(
+            [_row(counts[name]) for name in index],
+            columns=columns,
+            index=index
+        )
+
+def create_hand_histogram(raw_data: pd.DataFrame) -> pd.DataFrame:
+    return HandHistogram().update(raw_data).result()
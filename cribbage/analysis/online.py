@@ -0,0 +1,138 @@
+import pandas as pd
+import numpy as np
+
+from cribbage.constants import TURNS, CRIB, WINNER, PAIR
+from cribbage.analysis.game import paired_differences, paired_columns
+
+class RunningStats:
+    """
+    RunningStats keeps the count, mean and sum of squared deviations of a
+    stream of values using Welford's method. Values can be added in batches
+    and two accumulators can be merged, giving the same result as if every
+    value had gone through one accumulator. NaN values are skipped, the same
+    way pandas skips them when taking a mean.
+    """
+    __slots__ = ('count', 'mean', 'm2')
+
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def update(self, values) -> 'RunningStats':
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values):
+            mean = values.mean()
+            self.merge(RunningStats(len(values), mean, ((values - mean) ** 2).sum()))
+        return self
+
+    def merge(self, other: 'RunningStats') -> 'RunningStats':
+        count = self.count + other.count
+        if other.count:
+            delta = other.mean - self.mean
+            self.mean += delta * other.count / count
+            self.m2 += other.m2 + delta ** 2 * self.count * other.count / count
+            self.count = count
+        return self
+
+    def result(self) -> float:
+        return self.mean if self.count else np.nan
+
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+ROWS = (
+    ('total', lambda df: np.repeat(True, len(df.index))),
+    ('strat1_victory', lambda df: df[f'strat1_{WINNER}'] == 1),
+    ('strat2_victory', lambda df: df[f'strat2_{WINNER}'] == 1),
+    ('strat1_crib', lambda df: df[CRIB] == 0),
+    ('strat2_crib', lambda df: df[CRIB] == 1),
+)
+
+def _share(column: str, total: str):
+    return lambda df: df[column] / df[total]
+
+# Columns averaged by analyze_game and how to compute them from a chunk
+MEANS = {
+    'turns': lambda df: df[TURNS],
+    'average_victory_margin': lambda df: abs(df['strat1_total_points'] - df['strat2_total_points']),
+    **{
+        f'strat{p}_{section}_points': _share(f'strat{p}_{section}_points', f'strat{p}_total_points')
+        for section in ('peg', 'hand', 'crib') for p in (1, 2)
+    },
+}
+
+# The column order used by analyze_game
+COLUMNS = ['games', 'turns', 'average_victory_margin', 'strat1_wins', 'strat2_wins',
+    'strat1_peg_points', 'strat2_peg_points', 'strat1_hand_points', 'strat2_hand_points',
+    'strat1_crib_points', 'strat2_crib_points']
+
+class GameAnalyzer:
+    """
+    GameAnalyzer produces the same table as analyze_game, but updates it
+    chunk by chunk as games arrive instead of needing every game at once.
+    Analyzers built from different shards or workers can be merged.
+    """
+    def __init__(self):
+        self.games = {row: 0 for row, _ in ROWS}
+        self.wins = {row: [0, 0] for row, _ in ROWS}
+        self.stats = {row: {column: RunningStats() for column in MEANS} for row, _ in ROWS}
+        # Only used for duplicate games, which come in whole pairs per chunk
+        self.duplicate = False
+        self.paired = {'win': RunningStats(), 'margin': RunningStats()}
+
+    def update(self, df: pd.DataFrame) -> 'GameAnalyzer':
+        if PAIR in df.columns:
+            self.duplicate = True
+            pairs = paired_differences(df)
+            for column, stats in self.paired.items():
+                stats.update(pairs[column])
+        for row, mask in ROWS:
+            _df = df[mask(df)]
+            self.games[row] += len(_df.index)
+            for p in (0, 1):
+                self.wins[row][p] += int(_df[f'strat{p + 1}_{WINNER}'].sum())
+            for column, values in MEANS.items():
+                self.stats[row][column].update(values(_df))
+        return self
+
+    def merge(self, other: 'GameAnalyzer') -> 'GameAnalyzer':
+        for row, _ in ROWS:
+            self.games[row] += other.games[row]
+            for p in (0, 1):
+                self.wins[row][p] += other.wins[row][p]
+            for column in MEANS:
+                self.stats[row][column].merge(other.stats[row][column])
+        self.duplicate |= other.duplicate
+        for column, stats in self.paired.items():
+            stats.merge(other.paired[column])
+        return self
+
+    def result(self) -> pd.DataFrame:
+        def _row(row: str) -> pd.Series:
+            values = {
+                'games': self.games[row],
+                'strat1_wins': self.wins[row][0],
+                'strat2_wins': self.wins[row][1],
+                **{column: stats.result() for column, stats in self.stats[row].items()},
+            }
+            return pd.Series({column: values[column] for column in COLUMNS}, name=row)
+        analysis = pd.DataFrame(_row(row) for row, _ in ROWS)
+        if self.duplicate:
+            win, margin = self.paired['win'], self.paired['margin']
+            paired = paired_columns(win.result(), np.sqrt(win.variance() / win.count),
+                                     margin.result(), np.sqrt(margin.variance() / margin.count))
+            for column, value in paired.items():
+                analysis[column] = np.nan
+                analysis.loc['total', column] = value
+        return analysis
+
+    def variances(self) -> pd.DataFrame:
+        """
+        The sample variance of each averaged column, by row group.
+        """
+        return pd.DataFrame(
+            [pd.Series({column: stats.variance() for column, stats in self.stats[row].items()}, name=row)
+             for row, _ in ROWS]
+        )
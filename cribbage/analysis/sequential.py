@@ -0,0 +1,91 @@
+from statistics import NormalDist
+from math import log, sqrt
+import pandas as pd
+
+from cribbage.constants import WINNER
+
+class StoppingRule:
+    """
+    A StoppingRule follows strat1's wins as chunks of games arrive and
+    decides when enough games have been played to tell the strategies apart.
+    It can only stop between chunks, so it's checked once per shard.
+    """
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+
+    def update(self, df: pd.DataFrame) -> 'StoppingRule':
+        self.games += len(df.index)
+        self.wins += int(df[f'strat1_{WINNER}'].sum())
+        return self
+
+    def decided(self) -> bool:
+        pass
+
+    def result(self) -> pd.Series:
+        return pd.Series({
+            'games': self.games,
+            'strat1_wins': self.wins,
+            'win_rate': self.wins / self.games if self.games else float('nan'),
+            'decided': self.decided(),
+        })
+
+class WinRateInterval(StoppingRule):
+    """
+    WinRateInterval stops once the Wilson score interval for strat1's win
+    rate is narrower than width at the given confidence.
+    """
+    def __init__(self, width: float, confidence: float = 0.95):
+        super().__init__()
+        self.width = width
+        self.z = NormalDist().inv_cdf((1 + confidence) / 2)
+
+    def interval(self) -> (float, float):
+        if not self.games:
+            return 0.0, 1.0
+        n, p, z = self.games, self.wins / self.games, self.z
+        center = (p + z ** 2 / (2 * n)) / (1 + z ** 2 / n)
+        spread = z * sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / (1 + z ** 2 / n)
+        return center - spread, center + spread
+
+    def decided(self) -> bool:
+        lower, upper = self.interval()
+        return upper - lower < self.width
+
+    def result(self) -> pd.Series:
+        lower, upper = self.interval()
+        return pd.concat([super().result(), pd.Series({'lower': lower, 'upper': upper})])
+
+class SPRT(StoppingRule):
+    """
+    SPRT runs Wald's sequential probability ratio test of strat1's win rate
+    being p0 (the null hypothesis) against it being p1. It stops once the
+    log likelihood ratio crosses either bound, which keeps the chances of
+    wrongly accepting p1 or p0 under alpha and beta.
+    """
+    def __init__(self, p1: float = 0.55, p0: float = 0.5, alpha: float = 0.05, beta: float = 0.05):
+        super().__init__()
+        self.p0, self.p1 = p0, p1
+        self.lower = log(beta / (1 - alpha))
+        self.upper = log((1 - beta) / alpha)
+
+    def llr(self) -> float:
+        losses = self.games - self.wins
+        return self.wins * log(self.p1 / self.p0) + losses * log((1 - self.p1) / (1 - self.p0))
+
+    def decision(self) -> str:
+        """
+        Returns 'p1' or 'p0' for the accepted hypothesis, or None.
+        """
+        llr = self.llr()
+        if llr >= self.upper:
+            return 'p1'
+        if llr <= self.lower:
+            return 'p0'
+        return None
+
+    def decided(self) -> bool:
+        return self.decision() is not None
+
+    def result(self) -> pd.Series:
+        return pd.concat([super().result(), pd.Series({'llr': self.llr(), 'accepted': self.decision()})])
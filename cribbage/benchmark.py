@@ -0,0 +1,208 @@
+from cribbage.strategies import strategies, RandomStrategy
+from cribbage.score import scoreHand, scorePeg
+from cribbage.pegging import PeggingHistory
+from cribbage.deck import RandomDeck, BlockDeck
+from cribbage.game import game
+from cribbage.fast_game import fast_game
+from cribbage.simulate import simulate, seed_strategies
+from cribbage.cache import LRUCache
+from cribbage.constants import POINT_CAP
+from cribbage.logger import logger
+from fnmatch import fnmatch
+from itertools import count, cycle
+from random import Random
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+import datetime
+import json
+import platform
+import time
+import numpy as np
+
+# Different inputs the scoring benchmarks cycle through, so they aren't a
+# benchmark of one input
+INPUTS = 200
+
+# Deals generated at a time for the strategy benchmarks, which never repeat
+# a deal so that they measure caches as they'd be used in games
+DEAL_BLOCK = 10000
+
+# Games played by each call of the simulate benchmarks
+SIMULATE_GAMES = 100
+
+def _deals(seed: int = 0) -> List[Tuple[List[int], List[int], int]]:
+    deck = RandomDeck(Random(seed))
+    return [deck.deal() for _ in range(INPUTS)]
+
+def _deal_stream(seed: int = 0) -> Iterator[Tuple[List[int], List[int], int]]:
+    # Distinct deals forever, generated a block at a time
+    for block in count():
+        deck = BlockDeck(seed, block * DEAL_BLOCK, (block + 1) * DEAL_BLOCK, turns=1)
+        for deal, in deck.block.tolist():
+            yield deal[:6], deal[6:12], deal[12]
+
+def _pegging_state(deal: Tuple[List[int], List[int], int]) -> Tuple[List[int], PeggingHistory]:
+    # A kept hand for player 0 after player 1 has led a card
+    options, other, _ = deal
+    history = PeggingHistory()
+    history.add(other[0], 1)
+    return options[:4], history
+
+def _fresh_strategy(name: str):
+    # A new instance, with empty caches, so earlier benchmarks of strategies
+    # that share a class level cache (like BruteForce.cache) don't fill it
+    factory, args = strategies.factory(name)
+    strategy = factory(*args)
+    for cls in type(strategy).__mro__:
+        for value in vars(cls).values():
+            if isinstance(value, LRUCache):
+                value.clear()
+    return strategy
+
+def _bench_score_hand() -> Callable:
+    deals = cycle(_deals())
+    def _run():
+        options, _, cut = next(deals)
+        scoreHand(options[:4], cut)
+    return _run
+
+def _bench_score_peg() -> Callable:
+    plays = cycle([options[:4] for options, _, _ in _deals()])
+    return lambda: scorePeg(next(plays))
+
+def _bench_random_deck() -> Callable:
+    return RandomDeck(Random(0)).deal
+
+def _bench_block_deck() -> Callable:
+    # Includes generating each block of 1000 games (one turn each)
+    games = iter(())
+    def _run():
+        nonlocal games
+        game_deck = next(games, None)
+        if game_deck is None:
+            deck = BlockDeck(0, 0, 1000, turns=1)
+            games = (deck.game(n) for n in range(1, 1000))
+            game_deck = deck.game(0)
+        game_deck.deal()
+    return _run
+
+def _bench_choose_hand(name: str) -> Callable:
+    strategy = _fresh_strategy(name)
+    deals = enumerate(_deal_stream())
+    def _run():
+        i, (options, _, _) = next(deals)
+        strategy.chooseHand(options, i % 2)
+    return _run
+
+def _bench_peg(name: str) -> Callable:
+    strategy = _fresh_strategy(name)
+    states = map(_pegging_state, _deal_stream())
+    def _run():
+        hand, history = next(states)
+        strategy.peg(hand, 0, history)
+    return _run
+
+def _bench_game(play: Callable) -> Callable:
+    # Strategies use the global random state, seeded as simulate seeds shards
+    seed_strategies(0, 0)
+    deck = RandomDeck(Random(0))
+    strat1, strat2 = RandomStrategy(), RandomStrategy()
+    crib = cycle((0, 1))
+    return lambda: play(strat1, strat2, next(crib), POINT_CAP, deck)
+
+def _bench_simulate(fast: bool) -> Callable:
+    strat1, strat2 = RandomStrategy(), RandomStrategy()
+    return lambda: simulate(strat1, strat2, SIMULATE_GAMES, seed=0, fast=fast)
+
+def benchmarks() -> Dict[str, Tuple[Callable, int]]:
+    """
+    Returns every benchmark by name, as a function that sets it up and
+    returns a callable to time, along with the operations each call does.
+    Strategy benchmarks cover every non-interactive registered strategy,
+    each with a new instance and empty caches, and never repeat a deal.
+    """
+    suite = {
+        'score_hand': (_bench_score_hand, 1),
+        'score_peg': (_bench_score_peg, 1),
+        'random_deck_deal': (_bench_random_deck, 1),
+        'block_deck_deal': (_bench_block_deck, 1),
+    }
+    for name in strategies:
+        if not getattr(strategies.factory(name)[0], 'interactive', False):
+            suite[f'choose_hand.{name}'] = ((lambda name=name: _bench_choose_hand(name)), 1)
+            suite[f'peg.{name}'] = ((lambda name=name: _bench_peg(name)), 1)
+    suite['game'] = ((lambda: _bench_game(game)), 1)
+    suite['fast_game'] = ((lambda: _bench_game(fast_game)), 1)
+    suite['simulate'] = ((lambda: _bench_simulate(False)), SIMULATE_GAMES)
+    suite['simulate_fast'] = ((lambda: _bench_simulate(True)), SIMULATE_GAMES)
+    return suite
+
+def measure(func: Callable, ops: int = 1, repeat: int = 3, min_time: float = 0.2) -> float:
+    """
+    Calls func until min_time seconds have passed, repeat times, and returns
+    the best rate in operations per second.
+    """
+    func()  # warm up caches and lazy loading
+    best = 0.0
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < min_time:
+            func()
+            calls += 1
+            elapsed = time.perf_counter() - start
+        best = max(best, calls * ops / elapsed)
+    return best
+
+def run_benchmarks(patterns: Iterable[str] = None, repeat: int = 3, min_time: float = 0.2) -> dict:
+    """
+    Runs the benchmarks whose names match any of patterns (shell style, all
+    of them by default) and returns a JSON-ready report of operations per
+    second, along with details of the machine. Strategies whose tables
+    haven't been built are skipped.
+    """
+    results = {}
+    for name, (setup, ops) in benchmarks().items():
+        if patterns and not any(fnmatch(name, pattern) for pattern in patterns):
+            continue
+        try:
+            rate = measure(setup(), ops, repeat, min_time)
+        except FileNotFoundError as e:
+            logger.warning(f"Skipping {name}: {e}")
+            continue
+        results[name] = {'ops_per_second': rate, 'seconds_per_op': 1 / rate}
+    return {
+        'machine': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+        },
+        'time': datetime.datetime.now().isoformat(timespec='seconds'),
+        'results': results,
+    }
+
+def compare(report: dict, baseline: dict, threshold: float = 0.1) -> Dict[str, dict]:
+    """
+    Compares a report to a baseline report and returns the benchmarks that
+    are slower by more than threshold (as a fraction of the baseline rate),
+    with both rates and the change. Benchmarks missing from either report
+    are ignored.
+    """
+    regressions = {}
+    for name, result in report['results'].items():
+        if name not in baseline['results']:
+            continue
+        before, after = baseline['results'][name]['ops_per_second'], result['ops_per_second']
+        change = after / before - 1
+        if change < -threshold:
+            regressions[name] = {'baseline': before, 'current': after, 'change': change}
+    return regressions
+
+def save_report(report: dict, path: str):
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+def load_report(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
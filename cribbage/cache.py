@@ -0,0 +1,39 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+class LRUCache:
+    """
+    LRUCache is a bounded mapping that evicts the least recently used entry
+    when it's full. It counts hits and misses so the size can be tuned.
+    """
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Returns the value for key, calling compute to fill it on a miss.
+        """
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            value = self.entries[key] = compute()
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+            return value
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __repr__(self) -> str:
+        return f"LRUCache(hits={self.hits}, misses={self.misses}, size={len(self)}, maxsize={self.maxsize})"
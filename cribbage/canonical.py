@@ -0,0 +1,75 @@
+from cribbage.score import card, suit
+from itertools import combinations, combinations_with_replacement, permutations, product
+from math import factorial
+from typing import Iterator, List, Tuple
+
+def signatures(*groups: List[int]) -> List[Tuple]:
+    """
+    Returns one signature per suit: for each group of cards, the sorted ranks
+    of the cards in that suit. Relabeling suits only reorders the signatures.
+    """
+    return [
+        tuple(tuple(sorted(card(c) for c in group if suit(c) == s)) for group in groups)
+        for s in range(4)
+    ]
+
+def canonical_key(*groups: List[int]) -> Tuple:
+    """
+    Returns a key that is the same for any two sets of card groups that are
+    identical up to relabeling suits. For example, a hand and its discards.
+    """
+    return tuple(sorted(signatures(*groups)))
+
+def canonical_suits(*groups: List[int]) -> List[int]:
+    """
+    Returns a list mapping each suit to its canonical suit, which orders the
+    suits by signature. Suits with identical signatures are interchangeable,
+    so ties can go either way.
+    """
+    sigs = signatures(*groups)
+    mapping = [0] * 4
+    for canonical, s in enumerate(sorted(range(4), key=lambda s: sigs[s])):
+        mapping[s] = canonical
+    return mapping
+
+def relabel(cards: List[int], mapping: List[int]) -> List[int]:
+    """
+    Moves each card to the suit given by mapping.
+    """
+    return [card(c) + 13 * mapping[suit(c)] for c in cards]
+
+def relabelings(cards: List[int]) -> List[Tuple[int]]:
+    """
+    Returns every distinct deal that's the same as cards up to relabeling
+    suits, sorted. There are as many as canonical_deals gives as the
+    multiplicity of their canonical form.
+    """
+    return sorted({tuple(sorted(relabel(cards, mapping))) for mapping in permutations(range(4))})
+
+def _partitions(n: int, parts: int, largest: int) -> Iterator[Tuple[int]]:
+    # Non-increasing tuples of parts sizes (including 0) that add up to n
+    if parts == 0:
+        if n == 0:
+            yield ()
+        return
+    for size in range(min(n, largest), -1, -1):
+        for rest in _partitions(n - size, parts - 1, size):
+            yield (size,) + rest
+
+def canonical_deals(n: int = 6) -> Iterator[Tuple[Tuple[int], int]]:
+    """
+    Yields every deal of n cards in canonical form (as given by
+    canonical_suits) exactly once, along with its multiplicity: the number
+    of deals that are the same up to relabeling suits. The multiplicities
+    add up to C(52, n).
+    """
+    by_size = [list(combinations(range(13), k)) for k in range(n + 1)]
+    for sizes in _partitions(n, 4, n):
+        groups = [(size, sizes.count(size)) for size in sorted(set(sizes))]
+        choices = [combinations_with_replacement(by_size[size], count) for size, count in groups]
+        for chosen in product(*choices):
+            sigs = sorted(sig for group in chosen for sig in group)
+            multiplicity = 24
+            for sig in set(sigs):
+                multiplicity //= factorial(sigs.count(sig))
+            yield tuple(sorted(r + 13 * s for s, sig in enumerate(sigs) for r in sig)), multiplicity
@@ -0,0 +1,74 @@
+from typing import Set, Tuple
+import json
+import os
+import shutil
+import pandas as pd
+
+class Checkpoint:
+    """
+    A Checkpoint is a directory that keeps each completed shard of a long
+    run, so a run that's killed can be resumed without replaying them. A
+    manifest records the run's parameters, including its seed: shards are
+    seeded from the seed and their position, so that's all the random state
+    a resumed run needs to play the remaining shards exactly as they would
+    have been. Shards are pickled so they load back with the same types.
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.manifest = os.path.join(directory, 'manifest.json')
+
+    def start(self, params: dict) -> dict:
+        """
+        Starts a new checkpoint for a run with params, replacing any that's
+        already there.
+        """
+        self.remove()
+        os.makedirs(self.directory)
+        def _dump(path: str):
+            with open(path, 'w') as f:
+                json.dump(params, f, indent=2)
+        self._write(self.manifest, _dump)
+        return params
+
+    def resume(self, params: dict) -> dict:
+        """
+        Returns the saved parameters of the run being resumed, after checking
+        they match params. Parameters that are None in params (like a seed
+        that wasn't given) are taken from the checkpoint.
+        """
+        if not os.path.exists(self.manifest):
+            raise FileNotFoundError(f"No checkpoint to resume in {self.directory}")
+        with open(self.manifest) as f:
+            saved = json.load(f)
+        for key, value in params.items():
+            if value is not None and saved.get(key) != value:
+                raise ValueError(f"Can't resume: {key} was {saved.get(key)} in the checkpoint, not {value}")
+        return saved
+
+    def completed(self) -> Set[Tuple[int, int]]:
+        shards = set()
+        for name in os.listdir(self.directory):
+            if name.startswith('shard_') and name.endswith('.pkl'):
+                start, stop = name[len('shard_'):-len('.pkl')].split('_')
+                shards.add((int(start), int(stop)))
+        return shards
+
+    def load(self, shard: Tuple[int, int]) -> pd.DataFrame:
+        return pd.read_pickle(self._path(shard))
+
+    def save(self, shard: Tuple[int, int], chunk: pd.DataFrame):
+        self._write(self._path(shard), chunk.to_pickle)
+
+    def remove(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _path(self, shard: Tuple[int, int]) -> str:
+        start, stop = shard
+        return os.path.join(self.directory, f'shard_{start}_{stop}.pkl')
+
+    def _write(self, path: str, write):
+        # Write to a temporary file and rename it, so a run killed mid-write
+        # never leaves a partial file behind
+        temporary = f'{path}.tmp'
+        write(temporary)
+        os.replace(temporary, path)
@@ -1,6 +1,7 @@
 TURNS = 'turns'
 WINNER = 'winner'
 CRIB = 'crib_start'
+PAIR = 'pair'
 TOTAL_POINTS = 'total_points'
 HAND_POINTS = 'hand_points'
 CRIB_POINTS = 'crib_points'
@@ -9,3 +10,8 @@ JACK_POINTS = 'jack_points'
 
 PEG_CAP = 31
 POINT_CAP = 121
+
+# Number of games (or hands) in each unit of work. Shards are seeded by their
+# position, so results only depend on the seed and shard size, never on the
+# number of workers.
+SHARD_SIZE = 1000
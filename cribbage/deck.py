@@ -1,5 +1,10 @@
 from typing import List
-from random import shuffle
+from random import Random, shuffle
+import numpy as np
+
+# Deals generated up front for each game in a BlockDeck. Games that go on
+# longer get more deals from a generator of their own.
+BLOCK_TURNS = 32
 
 class Deck:
     """
@@ -9,9 +14,62 @@ class Deck:
         pass
 
 class RandomDeck(Deck):
-    def __init__(self):
+    """
+    RandomDeck shuffles the full deck for every deal. It uses the global
+    random state unless it's given its own Random instance.
+    """
+    def __init__(self, rng: Random = None):
         self.deck = list(range(52))
+        self.shuffle = rng.shuffle if rng else shuffle
     
     def deal(self) -> (List[int], List[int], int):
-        shuffle(self.deck)
+        self.shuffle(self.deck)
         return self.deck[:6], self.deck[6:12], self.deck[12]
+
+def _permutations(seed_sequence: np.random.SeedSequence, shape: tuple) -> np.ndarray:
+    # The first 13 cards of a shuffled deck for each deal in shape
+    rng = np.random.default_rng(seed_sequence)
+    decks = np.broadcast_to(np.arange(52, dtype=np.int8), shape + (52,))
+    return rng.permuted(decks, axis=-1)[..., :13]
+
+class BlockDeck:
+    """
+    BlockDeck generates the deals for games start to stop - 1 in one block of
+    permutations from a seeded generator. game(number) returns a Deck that
+    deals that game's turns in order. Each game's deals only depend on the
+    seed, start and stop, not on how many turns other games took, so any two
+    pairs of strategies see exactly the same deals for the same game (common
+    random numbers) and differences between them aren't down to the cards.
+    """
+    def __init__(self, seed: int, start: int = 0, stop: int = 1, turns: int = BLOCK_TURNS):
+        self.seed = seed
+        self.start = start
+        self.stop = stop
+        self.block = _permutations(np.random.SeedSequence(seed, spawn_key=(start, stop)), (stop - start, turns))
+
+    def game(self, number: int) -> 'GameDeck':
+        if not self.start <= number < self.stop:
+            raise IndexError(number)
+        more = lambda extension: _permutations(
+            np.random.SeedSequence(self.seed, spawn_key=(self.start, self.stop, number, extension)),
+            (len(self.block[0]),))
+        return GameDeck(self.block[number - self.start], more)
+
+class GameDeck(Deck):
+    """
+    GameDeck deals one game's turns from a block of deals, asking more for
+    another block if the game outlasts it.
+    """
+    def __init__(self, deals: np.ndarray, more=None):
+        self.deals = deals.tolist()
+        self.more = more
+        self.turn = 0
+        self.extensions = 0
+
+    def deal(self) -> (List[int], List[int], int):
+        if self.turn == len(self.deals):
+            self.deals.extend(self.more(self.extensions).tolist())
+            self.extensions += 1
+        deal = self.deals[self.turn]
+        self.turn += 1
+        return deal[:6], deal[6:12], deal[12]
@@ -0,0 +1,178 @@
+from cribbage.strategy import Strategy
+from cribbage.score import scoreHand, card
+from cribbage.io import formatCard
+from cribbage.deck import Deck, RandomDeck
+from cribbage.game import PeggingContext
+from cribbage.profiler import Profiler, timed
+from cribbage.logger import logger
+from cribbage.constants import TURNS, WINNER, CRIB, \
+    TOTAL_POINTS, HAND_POINTS, CRIB_POINTS, PEG_POINTS, JACK_POINTS
+from collections import namedtuple
+from typing import List
+import logging
+
+PLAYER_FIELDS = (HAND_POINTS, CRIB_POINTS, PEG_POINTS, JACK_POINTS, TOTAL_POINTS, WINNER)
+
+# The same fields, in the same order, as the Series returned by game.game
+GameResult = namedtuple('GameResult', [f'strat{p}_{k}' for p in (1, 2) for k in PLAYER_FIELDS] + [TURNS, CRIB])
+
+SECTION_MESSAGES = {
+    HAND_POINTS: "in their hand",
+    CRIB_POINTS: "in their crib",
+    PEG_POINTS: "by pegging",
+    JACK_POINTS: "when the Jack was cut",
+}
+
+class PlayerScore:
+    """
+    PlayerScore keeps one player's points by game section, plus a running
+    total so that win checks don't need to add the sections up.
+    """
+    __slots__ = (HAND_POINTS, CRIB_POINTS, PEG_POINTS, JACK_POINTS, TOTAL_POINTS)
+
+    def __init__(self):
+        for section in self.__slots__:
+            setattr(self, section, 0)
+
+class FastGameContext:
+    """
+    FastGameContext follows the same rules as game.GameContext but keeps
+    scores in plain integers and only formats log messages when verbose.
+    """
+    __slots__ = ('scores', 'deck', 'crib', 'start_crib', 'turns', 'point_cap', 'verbose')
+
+    def __init__(self, crib: int, point_cap: int, deck: Deck):
+        self.scores = (PlayerScore(), PlayerScore())
+        self.deck = deck
+        self.crib = self.start_crib = crib
+        self.turns = 0
+        self.point_cap = point_cap
+        self.verbose = logger.isEnabledFor(logging.INFO)
+
+    def new_turn(self) -> (List[int], List[int], int):
+        if self.turns:
+            self.crib = 1 - self.crib
+        self.turns += 1
+
+        if self.verbose:
+            logger.info(f"Turn {self.turns}: player {self.crib + 1}'s crib.")
+            logger.info(f"Player 1 score: {self.scores[0].total_points}")
+            logger.info(f"Player 2 score: {self.scores[1].total_points}\n")
+
+        return self.deck.deal()
+
+    def add_points(self, player: int, game_section: str, points: int) -> bool:
+        """
+        add_points adds the specified number of points to the player's hand.
+        It returns True if the player has surpassed the number of points
+        required to win and False otherwise.
+        """
+        if not points:
+            return False
+
+        if self.verbose:
+            logger.info(f"Player {player + 1} scored {points} {SECTION_MESSAGES[game_section]}.")
+
+        score = self.scores[player]
+        setattr(score, game_section, getattr(score, game_section) + points)
+        score.total_points += points
+        return score.total_points >= self.point_cap
+
+    def finish_game(self) -> GameResult:
+        result = []
+        for strat, score in enumerate(self.scores):
+            total = min(self.point_cap, score.total_points)
+            winner = total == self.point_cap
+            if winner and self.verbose:
+                logger.info(f"\nGame over. Player {strat + 1} wins!")
+            result.extend((score.hand_points, score.crib_points, score.peg_points, score.jack_points, total, winner))
+        return GameResult(*result, self.turns, self.start_crib)
+
+def fast_game(strat1: Strategy, strat2: Strategy, crib: int, point_cap: int, deck: Deck = None,
+              profiler: Profiler = None) -> GameResult:
+    """
+    fast_game plays a game exactly like game.game, producing the same outcome
+    for the same deals and strategy decisions, but without pandas or logging
+    overhead. It returns a GameResult with the same fields as game.game.
+    Phases are timed for profiler like game.game.
+    """
+    game_context = FastGameContext(crib, point_cap, deck or RandomDeck())
+    score_hand = timed(profiler, 'hand_scoring', scoreHand)
+    score_crib = timed(profiler, 'crib_scoring', scoreHand)
+
+    while True:
+        options1, options2, cutCard = game_context.new_turn()
+        crib_hand = []
+
+        hand1 = strat1.chooseHand(options1, 1 - game_context.crib)
+        assert(all(card in options1 for card in hand1))
+        crib_hand.extend(card for card in options1 if card not in hand1)
+
+        hand2 = strat2.chooseHand(options2, game_context.crib)
+        assert(all(card in options2 for card in hand2))
+        crib_hand.extend(card for card in options2 if card not in hand2)
+
+        if game_context.verbose:
+            logger.info(f"{formatCard(cutCard)} was cut.\n")
+        strat1.observeTurn(0, hand1, crib_hand[:2], cutCard)
+        strat2.observeTurn(1, hand2, crib_hand[2:], cutCard)
+        if card(cutCard) == 10 and game_context.add_points(game_context.crib, JACK_POINTS, 2):
+            break
+
+        if fast_peg(game_context, [strat1, strat2], [hand1.copy(), hand2.copy()], profiler):
+            break
+
+        hand_points = [
+            score_hand(hand1, cutCard, 1 - game_context.crib),
+            score_hand(hand2, cutCard, game_context.crib)
+        ]
+        crib_points = score_crib(crib_hand, cutCard)
+
+        if game_context.add_points(1 - game_context.crib, HAND_POINTS, hand_points[1 - game_context.crib]) or \
+           game_context.add_points(game_context.crib, HAND_POINTS, hand_points[game_context.crib]) or \
+           game_context.add_points(game_context.crib, CRIB_POINTS, crib_points):
+            break
+
+    return timed(profiler, 'results', game_context.finish_game)()
+
+def fast_peg(game_context: FastGameContext, strategies: List[Strategy], hands: List[List[int]],
+             profiler: Profiler = None) -> bool:
+    """
+    fast_peg plays the pegging sub-game with the same rules as game.peg.
+    """
+    pegging_context = PeggingContext(game_context.crib)
+    add = timed(profiler, 'peg_scoring', pegging_context.add)
+    verbose = game_context.verbose
+
+    if verbose:
+        logger.info("Pegging\n")
+    while hands[0] or hands[1]:
+        turn = pegging_context.turn
+        if verbose:
+            logger.info(f"Player {turn + 1} to play (total: {pegging_context.total()}).")
+
+        options = pegging_context.can_play(hands[turn])
+        if options:
+            card = strategies[turn].peg(options, turn, pegging_context.ctx)
+            assert(card in hands[turn])
+
+            hands[turn].remove(card)
+            add(card)
+
+            play_score = pegging_context.score()
+            if verbose:
+                logger.info(f"Player {turn + 1} played {formatCard(card)}.")
+            if game_context.add_points(turn, PEG_POINTS, play_score):
+                return True
+
+        if not (pegging_context.can_play(hands[0]) or pegging_context.can_play(hands[1])):
+            ctx = pegging_context.total()
+            if verbose:
+                logger.info(f"No one can play (total: {ctx}). Go for Player {turn + 1}.\n")
+            if game_context.add_points(turn, PEG_POINTS, 2 if ctx == 31 else 1):
+                return True
+
+            pegging_context.reset()
+
+        pegging_context.switch_turn()
+    return False
@@ -1,7 +1,9 @@
 from cribbage.strategy import Strategy
-from cribbage.score import scoreHand, scorePeg, value
+from cribbage.score import scoreHand, value
 from cribbage.io import formatCard
 from cribbage.deck import Deck, RandomDeck
+from cribbage.pegging import PeggingHistory
+from cribbage.profiler import Profiler, timed
 from cribbage.logger import logger, setLogLevel
 from cribbage.constants import TURNS, WINNER, CRIB, \
     TOTAL_POINTS, HAND_POINTS, CRIB_POINTS, PEG_POINTS, JACK_POINTS, PEG_CAP
@@ -70,10 +72,13 @@ class GameContext:
         result[CRIB] = self.start_crib
         return result
 
-def game(strat1: Strategy, strat2: Strategy, crib: int, point_cap: int) -> pd.Series:
+def game(strat1: Strategy, strat2: Strategy, crib: int, point_cap: int, deck: Deck = None,
+         profiler: Profiler = None) -> pd.Series:
     """
     This function takes care of actual game simulation. crib is 1 if strat2
-    starts with the crib and 0 otherwise.
+    starts with the crib and 0 otherwise. Cards are dealt from deck, which
+    defaults to a new RandomDeck. Given a profiler, the pegging, scoring and
+    result phases are timed for it.
     It returns a pandas series with information about the game.
      - strat1_score: the score for strategy 1
      - strat1_hand: the number of points strat1 gained from their hand
@@ -82,35 +87,39 @@ def game(strat1: Strategy, strat2: Strategy, crib: int, point_cap: int) -> pd.Se
      - ... all the same fields for strat2 ...
     """
 
-    game_context = GameContext(crib, point_cap, RandomDeck())
+    game_context = GameContext(crib, point_cap, deck or RandomDeck())
+    score_hand = timed(profiler, 'hand_scoring', scoreHand)
+    score_crib = timed(profiler, 'crib_scoring', scoreHand)
 
     while True:
         options1, options2, cutCard = game_context.new_turn()
         crib_hand = []
 
         # Choose strat1 hand
-        hand1 = strat1.chooseHand(options1, 1 - crib)
+        hand1 = strat1.chooseHand(options1, 1 - game_context.crib)
         assert(all(card in options1 for card in hand1))
         crib_hand.extend(card for card in options1 if card not in hand1)
 
         # Choose strat2 hand
-        hand2 = strat2.chooseHand(options2, crib)
+        hand2 = strat2.chooseHand(options2, game_context.crib)
         assert(all(card in options2 for card in hand2))
         crib_hand.extend(card for card in options2 if card not in hand2)
 
         logger.info(f"{formatCard(cutCard)} was cut.\n")
+        strat1.observeTurn(0, hand1, crib_hand[:2], cutCard)
+        strat2.observeTurn(1, hand2, crib_hand[2:], cutCard)
         if "J" in formatCard(cutCard) and game_context.add_points(game_context.crib, JACK_POINTS, 2):
             break
 
-        if peg(game_context, [strat1, strat2], [hand1.copy(), hand2.copy()]):
+        if peg(game_context, [strat1, strat2], [hand1.copy(), hand2.copy()], profiler):
             break
 
         # Score the hands here
         hand_points = [
-            scoreHand(hand1, cutCard, 1 - game_context.crib),
-            scoreHand(hand2, cutCard, game_context.crib)
+            score_hand(hand1, cutCard, 1 - game_context.crib),
+            score_hand(hand2, cutCard, game_context.crib)
         ]
-        crib_points  = scoreHand(crib_hand,  cutCard)
+        crib_points  = score_crib(crib_hand, cutCard)
         
         # The person without the crib always gets the chance to score their 
         # hand first. We'll also check for a win condition after every addition
@@ -121,39 +130,76 @@ def game(strat1: Strategy, strat2: Strategy, crib: int, point_cap: int) -> pd.Se
            game_context.add_points(game_context.crib, CRIB_POINTS, crib_points):
             break
     
-    return game_context.finish_game()
+    return timed(profiler, 'results', game_context.finish_game)()
 
 class PeggingContext:
+    """
+    PeggingContext tracks the cards played while pegging in a PeggingHistory
+    (ctx), which is what strategies are given. It scores each play as it's
+    added, using the streak of matching ranks at the end of the current play
+    and the running total, so scoring a play doesn't need to look at the
+    whole play again the way scorePeg does.
+    """
     def __init__(self, crib: int):
-        self.ctx = [[]]
-        self.ctx_value = 0
+        self.ctx = PeggingHistory()
         self.turn = 1 - crib
+        self.streak = 0
+        self.points = 0
 
     def switch_turn(self):
         self.turn = 1 - self.turn
 
     def total(self) -> int:
-        return self.ctx_value
+        return self.ctx.total
 
     def cards_played(self) -> List[int]:
         """
         Get the cards played in the current play for scoring.
         """
-        return [c for c, _ in self.ctx[-1]]
+        return list(self.ctx.sequence())
 
     def add(self, card):
         """
-        Adds a card to the current play and updates the total value.
+        Adds a card to the current play, updates the total value and scores
+        the play.
+        """
+        ctx = self.ctx
+        cards, length = ctx.cards, ctx.length
+        previous = length - ctx.starts[-1]
+        rank = card % 13
+        self.streak = self.streak + 1 if previous and cards[length - 1] % 13 == rank else 1
+        ctx.add(card, self.turn)
+
+        # Runs: grow a mask of the ranks in each suffix of the play. Once a
+        # rank repeats, no longer suffix can be a run. A suffix is a run when
+        # its mask is a single block of set bits.
+        run = 0
+        mask = 1 << rank
+        for suffix in range(2, previous + 2):
+            bit = 1 << cards[length + 1 - suffix] % 13
+            if mask & bit:
+                break
+            mask |= bit
+            block = mask // (mask & -mask)
+            if suffix >= 3 and not block & (block + 1):
+                run = suffix
+
+        # n matching cards score n * (n - 1): 2 for a pair, 6 and 12 after
+        self.points = self.streak * (self.streak - 1) + run + (2 if ctx.total == 15 else 0)
+
+    def score(self) -> int:
+        """
+        Returns the points scored by the last card added. This matches
+        scorePeg(cards_played()).
         """
-        self.ctx[-1].append((card, self.turn))
-        self.ctx_value += value(card)
+        return self.points
 
     def reset(self):
         """
         Resets the current play.
         """
-        self.ctx_value = 0
-        self.ctx.append([])
+        self.ctx.reset()
+        self.streak = 0
 
     def can_play(self, hand: List[int]) -> List[int]:
         """
@@ -161,7 +207,8 @@ class PeggingContext:
         """
         return [c for c in hand if self.total() + value(c) <= PEG_CAP]
 
-def peg(game_context: GameContext, strategies: List[Strategy], hands: List[List[int]]) -> bool:
+def peg(game_context: GameContext, strategies: List[Strategy], hands: List[List[int]],
+        profiler: Profiler = None) -> bool:
     """
     peg takes care of the pegging sub-game before scoring the actual hands. It
     takes a GameContext, strategies and hands. While players have cards to
@@ -172,6 +219,7 @@ def peg(game_context: GameContext, strategies: List[Strategy], hands: List[List[
     without playing any more cards.
     """
     pegging_context = PeggingContext(game_context.crib)
+    add = timed(profiler, 'peg_scoring', pegging_context.add)
 
     # While both players have cards remaining, peg
     logger.info("Pegging\n")
@@ -190,10 +238,10 @@ def peg(game_context: GameContext, strategies: List[Strategy], hands: List[List[
 
             # Remove the card from the hand and add it to the context
             hands[pegging_context.turn].remove(card)
-            pegging_context.add(card)
+            add(card)
 
             # Score based on the context
-            play_score = scorePeg(pegging_context.cards_played())
+            play_score = pegging_context.score()
             logger.info(f"Player {pegging_context.turn + 1} played {formatCard(card)}.")
             if game_context.add_points(pegging_context.turn, PEG_POINTS, play_score):
                 return True
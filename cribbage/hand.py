@@ -0,0 +1,121 @@
+from functools import lru_cache
+from math import comb
+from typing import Iterable, Iterator, Tuple
+
+# Each suit takes 13 bits of a hand's mask, one per rank
+SUIT_BITS = (1 << 13) - 1
+
+# The value of each rank when counting fifteens
+VALUES = tuple(min(rank + 1, 10) for rank in range(13))
+
+class Hand:
+    """
+    A Hand is a set of cards kept as a 52-bit mask, with bit c set for each
+    card c (so each suit is a block of 13 bits), along with the number of
+    cards of each rank. Checking for a card is a bit test rather than a scan
+    of a list, and pairs, runs and fifteens only depend on the rank counts
+    (see rankPoints). Hands are immutable; with and without return new ones.
+    Strategies still get and return lists of cards, which convert to and
+    from hands with Hand(cards) and list(hand).
+    """
+    __slots__ = ('mask', 'counts')
+
+    def __init__(self, cards: Iterable[int] = ()):
+        mask, counts = 0, [0] * 13
+        for c in cards:
+            mask |= 1 << c
+            counts[c % 13] += 1
+        self.mask = mask
+        self.counts = tuple(counts)
+
+    @classmethod
+    def _make(cls, mask: int, counts: Tuple[int]) -> 'Hand':
+        hand = cls.__new__(cls)
+        hand.mask = mask
+        hand.counts = counts
+        return hand
+
+    def with_card(self, c: int) -> 'Hand':
+        rank = c % 13
+        return Hand._make(self.mask | 1 << c, self.counts[:rank] + (self.counts[rank] + 1,) + self.counts[rank + 1:])
+
+    def without(self, c: int) -> 'Hand':
+        rank = c % 13
+        return Hand._make(self.mask & ~(1 << c), self.counts[:rank] + (self.counts[rank] - 1,) + self.counts[rank + 1:])
+
+    def suit(self, s: int) -> int:
+        """
+        Returns the ranks of the cards of suit s as a 13-bit mask.
+        """
+        return self.mask >> (13 * s) & SUIT_BITS
+
+    def flush(self) -> bool:
+        return self.mask != 0 and any(self.mask == self.suit(s) << (13 * s) for s in range(4))
+
+    def __contains__(self, c: int) -> bool:
+        return self.mask >> c & 1 == 1
+
+    def __iter__(self) -> Iterator[int]:
+        mask = self.mask
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def __len__(self) -> int:
+        return sum(self.counts)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Hand) and self.mask == other.mask
+
+    def __hash__(self) -> int:
+        return hash(self.mask)
+
+    def __repr__(self) -> str:
+        return f'Hand({list(self)})'
+
+def fifteens(counts: Tuple[int]) -> int:
+    """
+    Counts the sets of cards whose values add up to fifteen. Cards of the
+    same rank are interchangeable, so rather than trying every subset, this
+    builds up the number of ways to make each total one rank at a time:
+    k of the n cards of a rank can be picked in C(n, k) ways.
+    """
+    ways = [1] + [0] * 15
+    for rank, n in enumerate(counts):
+        if not n:
+            continue
+        value = VALUES[rank]
+        ways = [
+            sum(comb(n, k) * ways[total - k * value] for k in range(min(n, total // value) + 1))
+            for total in range(16)
+        ]
+    return ways[15]
+
+def pairs(counts: Tuple[int]) -> int:
+    # Every two cards of the same rank are a pair worth 2 points
+    return sum(n * (n - 1) for n in counts)
+
+def runs(counts: Tuple[int]) -> int:
+    """
+    Scores runs: each streak of three or more consecutive ranks scores its
+    length once for every way of picking one card of each rank.
+    """
+    points, length, ways = 0, 0, 1
+    for n in counts + (0,):
+        if n:
+            length, ways = length + 1, ways * n
+            continue
+        if length >= 3:
+            points += length * ways
+        length, ways = 0, 1
+    return points
+
+@lru_cache(maxsize=None)
+def rankPoints(counts: Tuple[int]) -> int:
+    """
+    Returns the points from fifteens, pairs and runs for cards with these
+    rank counts. There are only a few thousand counts for five cards, so
+    they're remembered.
+    """
+    return 2 * fifteens(counts) + pairs(counts) + runs(counts)
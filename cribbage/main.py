@@ -1,15 +1,25 @@
 import argparse
 import pathlib
-from cribbage.simulate import simulate, simulateHandChoice
+import sys
+from cribbage.sink import sinks
 from cribbage.strategies import strategies
-from cribbage.constants import POINT_CAP
-from cribbage.logger import logger, setLogLevel
-from cribbage.analysis import analyze_game, create_hand_histogram
+from cribbage.constants import POINT_CAP, SHARD_SIZE
+from cribbage.logger import setLogLevel
 
-STRATEGY_NAMES = tuple(strategies.keys())
-STRATEGIES_MESSAGE = "\n\n".join(f"{k}: {v.__doc__}" for k, v in strategies.items())
+# Only the modules a subcommand needs are imported, inside its handler, so
+# starting up doesn't wait for pandas, numpy or the strategies.
+STRATEGY_NAMES = tuple(strategies)
 
-parser = argparse.ArgumentParser(description=STRATEGIES_MESSAGE, formatter_class=argparse.RawTextHelpFormatter)
+class StrategyHelpParser(argparse.ArgumentParser):
+    """
+    StrategyHelpParser describes every strategy in its help, which means
+    importing them all, so the description is only filled in when needed.
+    """
+    def format_help(self) -> str:
+        self.description = "\n\n".join(f"{name}: {strategies.describe(name)}" for name in strategies)
+        return super().format_help()
+
+parser = StrategyHelpParser(formatter_class=argparse.RawTextHelpFormatter)
 
 subparsers = parser.add_subparsers()
 
@@ -18,38 +28,252 @@ game = subparsers.add_parser("game", help="Play a crib game between two strategi
 game.add_argument("strategy1", help="Player 1 Strategy", choices=STRATEGY_NAMES)
 game.add_argument("strategy2", help="Player 2 Strategy", choices=STRATEGY_NAMES)
 game.add_argument("-pc", "--point-cap", help=f"Score to play the game to (default {POINT_CAP})", default=121)
+game.add_argument("--fast", help="Use the fast game engine (same results, less overhead)", action="store_true")
+game.add_argument("--duplicate", action="store_true",
+    help="Play each deal twice with the strategies swapping seats and report paired differences")
+game.add_argument("--profile", action="store_true",
+    help="Time each phase of the games and each strategy's decisions (writes profile.csv and decision_latency.csv)")
+stopping = game.add_mutually_exclusive_group()
+stopping.add_argument("--ci-width", type=float,
+    help="Stop once the confidence interval of strategy1's win rate is narrower than this (--iterations is the most games played)")
+stopping.add_argument("--sprt", type=float, metavar="P1",
+    help="Stop once a sequential probability ratio test accepts a win rate of 0.5 or of P1 for strategy1")
+game.add_argument("--checkpoint", action="store_true",
+    help="Keep completed games in output/checkpoint until the run finishes, so an interrupted run can be resumed")
+game.add_argument("--resume", action="store_true",
+    help="Continue an interrupted --checkpoint run into the same output folder (implies --checkpoint)")
+game.add_argument("--confidence", type=float, default=0.95, help="Confidence level for --ci-width (default 0.95)")
+game.add_argument("--alpha", type=float, default=0.05, help="Chance of wrongly accepting P1 with --sprt (default 0.05)")
+game.add_argument("--beta", type=float, default=0.05, help="Chance of wrongly accepting 0.5 with --sprt (default 0.05)")
 
 def handle_game(args, output):
-    df = simulate(
+    from cribbage.simulate import simulateChunks, new_seed
+    from cribbage.analysis import GameAnalyzer, WinRateInterval, SPRT
+    from cribbage.profiler import Profiler
+    from cribbage.checkpoint import Checkpoint
+
+    if args.duplicate and (args.iterations % 2 or args.chunk_size % 2):
+        parser.error("--duplicate plays games in pairs, so --iterations and --chunk-size must be even")
+    checkpoint = Checkpoint(f'{output}/checkpoint') if args.checkpoint or args.resume else None
+    params = {
+        'strategy1': args.strategy1,
+        'strategy2': args.strategy2,
+        'iterations': args.iterations,
+        'point_cap': int(args.point_cap),
+        'seed': args.seed,
+        'chunk_size': args.chunk_size,
+        'fast': args.fast,
+        'duplicate': args.duplicate,
+    }
+    if args.resume:
+        try:
+            seed = checkpoint.resume(params)['seed']
+        except (FileNotFoundError, ValueError) as e:
+            parser.error(str(e))
+    else:
+        seed = new_seed() if args.seed is None else args.seed
+        if checkpoint is not None:
+            checkpoint.start({**params, 'seed': seed})
+    stop = None
+    if args.ci_width:
+        stop = WinRateInterval(args.ci_width, args.confidence)
+    elif args.sprt:
+        stop = SPRT(args.sprt, alpha=args.alpha, beta=args.beta)
+    profiler = Profiler() if args.profile else None
+    chunks = simulateChunks(
         strategies[args.strategy1],
         strategies[args.strategy2],
         args.iterations,
         args.point_cap,
+        args.workers,
+        seed,
+        args.chunk_size,
+        args.fast,
+        stop,
+        args.duplicate,
+        profiler,
+        checkpoint,
     )
-    df.to_csv(f'{output}/raw_game_data.csv')
-    analysis = analyze_game(df)
+    analyzer = GameAnalyzer()
+    with sinks[args.format](f'{output}/raw_game_data') as sink:
+        for chunk in chunks:
+            sink.write(chunk)
+            analyzer.update(chunk)
+    analysis = analyzer.result()
     analysis.to_csv(f'{output}/game_analysis.csv')
+    if profiler is not None:
+        profiler.report().to_csv(f'{output}/profile.csv')
+        profiler.latency_report().to_csv(f'{output}/decision_latency.csv')
+    if stop is not None:
+        result = stop.result()
+        result.to_csv(f'{output}/stopping_rule.csv', header=False)
+        print(f"{'Stopped' if result['decided'] else 'Undecided'} after {result['games']} games")
+    if checkpoint is not None:
+        checkpoint.remove()
 game.set_defaults(func=handle_game)
 
 # Hand choice parser
 hand_choice = subparsers.add_parser("hand-choice", help="Choose a hand from 6 cards and score it based on a cut card")
 hand_choice.add_argument("strategy", help="Strategy", choices=STRATEGY_NAMES)
+hand_choice.add_argument("--exact", action="store_true",
+    help="Score every possible deal with both crib flags and every cut instead of --iterations random ones (no raw data is written; "
+         "the *_table strategies are about 20 times faster than the strategies they're built from)")
 
 def handle_hand_choice(args, output):
-    df = simulateHandChoice(strategies[args.strategy], args.iterations)
-    df.to_csv(f'{output}/raw_hand_data.csv')
-    hist = create_hand_histogram(df)
+    from cribbage.simulate import simulateHandChoiceChunks, exactHandChoice
+    from cribbage.analysis import HandHistogram
+
+    if args.exact:
+        histogram = exactHandChoice(strategies[args.strategy], args.workers, args.chunk_size)
+        histogram.result().to_csv(f'{output}/hand_score_histogram.csv')
+        return
+    chunks = simulateHandChoiceChunks(strategies[args.strategy], args.iterations, args.workers, args.seed, args.chunk_size)
+    histogram = HandHistogram()
+    with sinks[args.format](f'{output}/raw_hand_data') as sink:
+        for chunk in chunks:
+            sink.write(chunk)
+            histogram.update(chunk)
+    hist = histogram.result()
     hist.to_csv(f'{output}/hand_score_histogram.csv')
 hand_choice.set_defaults(func=handle_hand_choice)
 
+# Tournament parser
+tournament = subparsers.add_parser("tournament",
+    help="Play --iterations games between every pair of strategies and write a matrix of win rates")
+tournament.add_argument("strategies", nargs="*", metavar="strategy",
+    help="Strategies to include (default every non-interactive strategy whose tables are built)")
+tournament.add_argument("-pc", "--point-cap", type=int, help=f"Score to play the games to (default {POINT_CAP})", default=POINT_CAP)
+tournament.add_argument("--calibration", type=int, default=2,
+    help="Games used to measure each strategy's cost for balancing workers (default 2)")
+
+def handle_tournament(args, output):
+    from cribbage.tournament import tournament as run_tournament
+
+    for name in args.strategies:
+        if name not in STRATEGY_NAMES:
+            parser.error(f"unknown strategy {name} (choose from {', '.join(STRATEGY_NAMES)})")
+    matrix = run_tournament(
+        args.strategies or None,
+        args.iterations,
+        args.point_cap,
+        args.workers,
+        args.seed,
+        args.chunk_size,
+        args.calibration,
+    )
+    matrix.to_csv(f'{output}/tournament.csv')
+tournament.set_defaults(func=handle_tournament)
+
+# Benchmark parser
+benchmark = subparsers.add_parser("benchmark",
+    help="Time scoring, dealing, each strategy's decisions and whole games, and write benchmark.json")
+benchmark.add_argument("benchmarks", nargs="*", metavar="pattern",
+    help="Only run benchmarks matching these patterns, like 'peg.*' (default all)")
+benchmark.add_argument("--baseline", help="A benchmark.json to compare against; slowdowns are reported and fail the run")
+benchmark.add_argument("--threshold", type=float, default=0.1,
+    help="Slowdown relative to the baseline that counts as a regression (default 0.1)")
+benchmark.add_argument("--min-time", type=float, default=0.2, help="Seconds to run each benchmark for, per repeat (default 0.2)")
+benchmark.add_argument("--repeat", type=int, default=3, help="Times to run each benchmark; the best is kept (default 3)")
+
+def handle_benchmark(args, output):
+    from cribbage.benchmark import run_benchmarks, compare, save_report, load_report
+
+    report = run_benchmarks(args.benchmarks, args.repeat, args.min_time)
+    save_report(report, f'{output}/benchmark.json')
+    for name, result in report['results'].items():
+        print(f"{name:40} {result['ops_per_second']:14.1f}/s")
+    if args.baseline:
+        regressions = compare(report, load_report(args.baseline), args.threshold)
+        for name, regression in regressions.items():
+            print(f"Regression in {name}: {regression['baseline']:.1f}/s -> {regression['current']:.1f}/s "
+                  f"({regression['change']:+.1%})")
+        if regressions:
+            sys.exit(1)
+benchmark.set_defaults(func=handle_benchmark)
+
+# Server parser
+serve = subparsers.add_parser("serve",
+    help="Serve games between people and strategies over TCP (try: nc localhost 7531) and write each finished game to server_games")
+serve.add_argument("--host", default="127.0.0.1", help="Address to listen on (default 127.0.0.1)")
+serve.add_argument("--port", type=int, default=7531, help="Port to listen on (default 7531)")
+serve.add_argument("-pc", "--point-cap", type=int, help=f"Score to play the games to (default {POINT_CAP})", default=POINT_CAP)
+
+def handle_serve(args, output):
+    import asyncio
+    import logging
+    import itertools
+    import pandas as pd
+    from cribbage.server import GameServer
+
+    logging.getLogger('asyncio').setLevel(logging.WARNING)
+    with sinks[args.format](f'{output}/server_games') as sink:
+        numbers = itertools.count()
+        def _record(name, result):
+            sink.write(pd.DataFrame([{'strategy': name, **result._asdict()}], index=[next(numbers)]))
+        server = GameServer(args.point_cap, on_result=_record)
+        try:
+            asyncio.run(server.serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+serve.set_defaults(func=handle_serve)
+
+# Score table parser
+score_table = subparsers.add_parser("build-score-table", help="Precompute the score of every hand and cut card (use with --score-table)")
+
+def handle_build_score_table(args, output):
+    from cribbage.tables import build_score_table
+
+    build_score_table(f'{output}/score_table.npy')
+score_table.set_defaults(func=handle_build_score_table)
+
+# Decision table parser
+decision_table = subparsers.add_parser("build-decision-table",
+    help="Record a strategy's hand choice for every deal (write to CRIBBAGE_TABLE_DIR to use the *_table strategies)")
+decision_table.add_argument("strategy", help="Strategy (one that scores hands, like expected_value)", choices=STRATEGY_NAMES)
+
+def handle_build_decision_table(args, output):
+    from cribbage.strategies import HandScore
+    from cribbage.tables import build_decision_table
+
+    if not isinstance(strategies[args.strategy], HandScore):
+        hand_score_names = (k for k in STRATEGY_NAMES if isinstance(strategies[k], HandScore))
+        parser.error(f"{args.strategy} doesn't score hands (choose from {', '.join(hand_score_names)})")
+    build_decision_table(strategies[args.strategy], f'{output}/{args.strategy}_decisions.npy', args.workers)
+decision_table.set_defaults(func=handle_build_decision_table)
+
+# Crib table parser
+crib_table = subparsers.add_parser("build-crib-table",
+    help="Precompute expected crib points for each pair of discards (write to CRIBBAGE_TABLE_DIR to use crib_expected_value)")
+crib_table.add_argument("--opponent", choices=STRATEGY_NAMES,
+    help="Weight the opponent's discards by this strategy's choices over --samples deals (default uniform)")
+crib_table.add_argument("--samples", type=int, default=10000,
+    help="Deals used to estimate how often --opponent discards each pair (default 10000)")
+
+def handle_build_crib_table(args, output):
+    from cribbage.tables import build_crib_table
+
+    opponent = strategies[args.opponent] if args.opponent else None
+    build_crib_table(f'{output}/crib_table.npy', opponent, args.samples, args.seed or 0)
+crib_table.set_defaults(func=handle_build_crib_table)
+
 parser.add_argument("-i", "--iterations", type=int, default=1, help="Number of iterations to run (default 1)")
+parser.add_argument("-w", "--workers", type=int, default=1, help="Number of processes to run games in (default 1)")
+parser.add_argument("-s", "--seed", type=int, help="Seed for reproducible runs; any strategies get the same deals for the same seed (default random)")
+parser.add_argument("-c", "--chunk-size", type=int, default=SHARD_SIZE,
+                    help=f"Results are written every this many iterations; also the seeding shard size (default {SHARD_SIZE})")
+parser.add_argument("-f", "--format", choices=tuple(sinks.keys()), default="csv", help="Format for raw data (default csv)")
 parser.add_argument("-v", "--verbose", help="Print information about the game (useful for human strategies)",
                     action="store_true")
+parser.add_argument("--score-table", help="Path to a table from build-score-table used to score hands")
 parser.add_argument("output", help="The output folder where analysis files are written")
 
 def main():
     args = parser.parse_args()
     setLogLevel(args.verbose)
+    if args.score_table:
+        from cribbage.score import useScoreTable
+        from cribbage.tables import ScoreTable
+        useScoreTable(ScoreTable.load(args.score_table))
     path = pathlib.Path(args.output)
     path.mkdir(parents=True, exist_ok=True)
     args.func(args, path.resolve())
@@ -0,0 +1,89 @@
+from array import array
+from typing import Iterator, List, Tuple
+
+# Each player pegs 4 cards in a standard deal, and there can be no more plays
+# than cards. Longer histories grow the buffers.
+MAX_CARDS = 8
+
+def _grow(buffer: array) -> array:
+    # A new buffer rather than resizing, which views handed out would prevent
+    return buffer + array(buffer.typecode, bytes(len(buffer)))
+
+class PeggingHistory:
+    """
+    PeggingHistory records the cards played while pegging in preallocated
+    buffers, sized for a standard deal and doubled if more cards are played
+    (views taken before then keep showing the old buffers). Strategies get read-only views of it without any copying: the
+    current sequence, its total, the cards each player has played and the
+    number of cards of each rank played so far.
+    For backwards compatibility it also behaves like the list of plays that
+    Strategy.peg used to receive: history[i] is a list of (card, player)
+    tuples for play i, the last of which is the current play.
+    """
+    __slots__ = ('cards', 'players', 'length', 'starts', 'total', 'by_player', 'counts', '_rank_counts')
+
+    def __init__(self):
+        self.cards = array('b', bytes(MAX_CARDS))
+        self.players = array('b', bytes(MAX_CARDS))
+        self.length = 0
+        self.starts = [0]
+        self.total = 0
+        self.by_player = (array('b', bytes(MAX_CARDS // 2)), array('b', bytes(MAX_CARDS // 2)))
+        self.counts = [0, 0]
+        self._rank_counts = bytearray(13)
+
+    def add(self, card: int, player: int):
+        rank = card % 13
+        if self.length == len(self.cards):
+            self.cards, self.players = _grow(self.cards), _grow(self.players)
+        if self.counts[player] == len(self.by_player[player]):
+            by_player = list(self.by_player)
+            by_player[player] = _grow(by_player[player])
+            self.by_player = tuple(by_player)
+        self.cards[self.length] = card
+        self.players[self.length] = player
+        self.length += 1
+        self.total += 10 if rank >= 10 else rank + 1
+        self.by_player[player][self.counts[player]] = card
+        self.counts[player] += 1
+        self._rank_counts[rank] += 1
+
+    def reset(self):
+        """
+        Starts a new play.
+        """
+        self.starts.append(self.length)
+        self.total = 0
+
+    def sequence(self) -> memoryview:
+        """
+        The cards in the current play.
+        """
+        return memoryview(self.cards)[self.starts[-1]:self.length].toreadonly()
+
+    def played_by(self, player: int) -> memoryview:
+        """
+        The cards player has played so far, which the other player has seen.
+        """
+        return memoryview(self.by_player[player])[:self.counts[player]].toreadonly()
+
+    def rank_counts(self) -> memoryview:
+        """
+        The number of cards of each rank (0 for aces to 12 for kings) played.
+        """
+        return memoryview(self._rank_counts).toreadonly()
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, play: int) -> List[Tuple[int, int]]:
+        if play < 0:
+            play += len(self.starts)
+        if not 0 <= play < len(self.starts):
+            raise IndexError(play)
+        start = self.starts[play]
+        stop = self.starts[play + 1] if play + 1 < len(self.starts) else self.length
+        return list(zip(self.cards[start:stop], self.players[start:stop]))
+
+    def __iter__(self) -> Iterator[List[Tuple[int, int]]]:
+        return (self[play] for play in range(len(self)))
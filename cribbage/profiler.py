@@ -0,0 +1,134 @@
+from cribbage.strategy import Strategy
+from cribbage.deck import Deck
+from time import perf_counter
+from typing import Callable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# Upper edges of the decision latency histogram bins in seconds: three per
+# decade from a microsecond to 100 seconds, then anything slower
+LATENCY_BINS = np.append(np.logspace(-6, 2, 25), np.inf)
+
+class Profiler:
+    """
+    Profiler records the number of calls and time spent in each phase of the
+    games it watches (dealing, each strategy's decisions, pegging, hand and
+    crib scoring and assembling the result), as well as a histogram of each
+    strategy's decision latencies. The engines time their own phases when
+    they're given a profiler, and strategies and decks are timed by wrapping
+    them, so nothing is slower when not profiling.
+    Profilers from separate shards or workers can be merged.
+    """
+    def __init__(self):
+        self.calls = {}
+        self.times = {}
+        self.latencies = {}
+
+    def record(self, phase: str, seconds: float):
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+        self.times[phase] = self.times.get(phase, 0.0) + seconds
+
+    def decision(self, phase: str, seconds: float):
+        """
+        Records a strategy decision, which also goes in its latency histogram.
+        """
+        self.record(phase, seconds)
+        if phase not in self.latencies:
+            self.latencies[phase] = np.zeros(len(LATENCY_BINS), dtype=np.int64)
+        self.latencies[phase][np.searchsorted(LATENCY_BINS, seconds)] += 1
+
+    def timed(self, phase: str, func: Callable) -> Callable:
+        def _timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(phase, perf_counter() - start)
+        return _timed
+
+    def strategy(self, strategy: Strategy, label: str) -> Strategy:
+        return ProfiledStrategy(strategy, label, self)
+
+    def deck(self, deck: Deck) -> Deck:
+        return ProfiledDeck(deck, self)
+
+    def merge(self, other: 'Profiler') -> 'Profiler':
+        for phase in other.calls:
+            self.calls[phase] = self.calls.get(phase, 0) + other.calls[phase]
+            self.times[phase] = self.times.get(phase, 0.0) + other.times[phase]
+        for phase, counts in other.latencies.items():
+            self.latencies[phase] = self.latencies.get(phase, 0) + counts
+        return self
+
+    def report(self) -> pd.DataFrame:
+        """
+        Returns the calls, total seconds, mean microseconds per call and
+        share of the total game time of each phase. The engine row is
+        whatever time in games isn't in any other phase.
+        """
+        calls, times = dict(self.calls), dict(self.times)
+        if 'game' in times:
+            calls['engine'] = calls['game']
+            times['engine'] = times['game'] - sum(t for phase, t in times.items() if phase != 'game')
+        report = pd.DataFrame({'calls': pd.Series(calls), 'seconds': pd.Series(times)})
+        report['mean_us'] = report['seconds'] / report['calls'] * 1e6
+        report['share'] = report['seconds'] / times.get('game', np.nan)
+        return report.sort_values('seconds', ascending=False)
+
+    def latency_report(self) -> pd.DataFrame:
+        """
+        Returns each strategy decision's latency histogram, with one column
+        per bin named by its upper edge in seconds.
+        """
+        columns = [f'<={edge:.3g}s' if np.isfinite(edge) else f'>{LATENCY_BINS[-2]:.3g}s' for edge in LATENCY_BINS]
+        return pd.DataFrame({phase: counts for phase, counts in sorted(self.latencies.items())}, index=columns).T
+
+def timed(profiler: Optional[Profiler], phase: str, func: Callable) -> Callable:
+    """
+    Returns func timed as phase by profiler, or func itself without one.
+    """
+    return func if profiler is None else profiler.timed(phase, func)
+
+class ProfiledStrategy(Strategy):
+    """
+    ProfiledStrategy times another strategy's decisions for a Profiler,
+    labelling them with the strategy's label (strat1 or strat2).
+    """
+    def __init__(self, strategy: Strategy, label: str, profiler: Profiler):
+        self.strategy = strategy
+        self.label = label
+        self.profiler = profiler
+        self.interactive = strategy.interactive
+
+    def chooseHand(self, options: List[int], crib: bool) -> List[int]:
+        start = perf_counter()
+        hand = self.strategy.chooseHand(options, crib)
+        self.profiler.decision(f'choose_hand.{self.label}', perf_counter() - start)
+        return hand
+
+    def observeTurn(self, player: int, hand: List[int], discarded: List[int], cutCard: int):
+        self.strategy.observeTurn(player, hand, discarded, cutCard)
+
+    def peg(self, hand: List[int], player: int, previousCards: List[List[Tuple[int]]]) -> int:
+        start = perf_counter()
+        card = self.strategy.peg(hand, player, previousCards)
+        self.profiler.decision(f'peg.{self.label}', perf_counter() - start)
+        return card
+
+class ProfiledDeck(Deck):
+    """
+    ProfiledDeck times another deck's deals for a Profiler. A wrapped
+    BlockDeck gives wrapped decks for each game.
+    """
+    def __init__(self, deck: Deck, profiler: Profiler):
+        self.deck = deck
+        self.profiler = profiler
+
+    def deal(self) -> (List[int], List[int], int):
+        start = perf_counter()
+        deal = self.deck.deal()
+        self.profiler.record('deal', perf_counter() - start)
+        return deal
+
+    def game(self, number: int) -> 'ProfiledDeck':
+        return ProfiledDeck(self.deck.game(number), self.profiler)
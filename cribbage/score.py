@@ -1,89 +1,113 @@
 from itertools import combinations
 from bisect import insort
 from typing import List, Tuple
+import numpy as np
+from cribbage.hand import Hand, fifteens, pairs, runs, rankPoints
 
 suit = lambda c: c // 13
 card = lambda c: c % 13
 value = lambda c: 10 if card(c) >= 10 else card(c) + 1
 
+# An optional precomputed table (see cribbage.tables.ScoreTable) that
+# scoreHand will use instead of scoring from scratch.
+_score_table = None
+
+def useScoreTable(table) -> None:
+    """
+    Routes scoreHand through a precomputed ScoreTable. Passing None goes back
+    to scoring each hand from scratch.
+    """
+    global _score_table
+    _score_table = table
+
 def flush(hand: List[int], cutCard: int, crib: bool) -> int:
     # Flush points
-    flush = 0
-    if all(suit(c) == suit(hand[0]) for c in hand):
-        flush += 4
-    if flush and suit(cutCard) == suit(hand[0]):
-        flush += 1
-    elif crib:
-        flush = 0
-    return flush
+    return _flush(Hand(hand), cutCard, crib)
+
+def _flush(hand: Hand, cutCard: int, crib: bool) -> int:
+    if not hand.flush():
+        return 0
+    # All the cards are one suit, so the cut matches if it shares any's suit
+    if hand.suit(suit(cutCard)):
+        return 5
+    return 0 if crib else 4
 
 def jack(hand: List[int], cutCard: int):
-    # Jack point
-    jack = 0
-    if any(card(c) == 10 and suit(c) == suit(cutCard) for c in hand):
-        jack += 1
-    return jack
+    # Jack point: the jack of the cut card's suit
+    return _jack(Hand(hand), cutCard)
 
-def pair(hand: List[int], cutCard: int) -> int:
-    fullHand = sorted(card(c) for c in hand + [cutCard]) 
+def _jack(hand: Hand, cutCard: int) -> int:
+    return 1 if 10 + 13 * suit(cutCard) in hand else 0
 
-    # Pair points
-    pair = 0
-    for i in range(4):
-        for j in range(i + 1, 5):
-            if fullHand[i] == fullHand[j]:
-                pair += 2
-    return pair
+def pair(hand: List[int], cutCard: int) -> int:
+    return pairs(Hand(hand + [cutCard]).counts)
 
 def run(hand: List[int], cutCard: int) -> int:
-    fullHand = sorted(card(c) for c in hand + [cutCard]) 
-
-    # Run points
-    run = 0
-    for runVal in range(5, 2, -1):
-        for arr in combinations(fullHand, runVal):
-            if all(arr[i] + 1 == arr[i+1] for i in range(len(arr) - 1)):
-                run += runVal
-        if run:
-            break
-    return run
+    return runs(Hand(hand + [cutCard]).counts)
 
 def fifteen(hand: List[int], cutCard: int) -> int:
-    # Fifteen points
-    fullHand = [value(c) for c in hand + [cutCard]]
-    fifteen = 0
-    total = sum(fullHand)
-    
-    if total == 15:
-        fifteen += 2
-
-    for i in range(5):
-        if total - fullHand[i] == 15:
-            fifteen += 2
-
-    for i in range(4):
-        for j in range(i + 1, 5):
-            if fullHand[i] + fullHand[j] == 15:
-                fifteen += 2
-            if total - fullHand[i] - fullHand[j] == 15:
-                fifteen += 2
-    return fifteen
+    return 2 * fifteens(Hand(hand + [cutCard]).counts)
 
 def scoreHand(hand: List[int], cutCard: int, crib: bool = False):
+    if _score_table is not None:
+        return _score_table.score(hand, cutCard, crib)
 
-    result = { 
-        'flush': flush(hand, cutCard, crib), 
-        'jack': jack(hand, cutCard),
-        'pair': pair(hand, cutCard),
-        'run': run(hand, cutCard),
-        'fifteen': fifteen(hand, cutCard),
-    }
+    # Pairs, runs and fifteens only depend on the ranks of the five cards
+    cards = Hand(hand)
+    return rankPoints(cards.with_card(cutCard).counts) + _flush(cards, cutCard, crib) + _jack(cards, cutCard)
 
-    return sum(v for v in result.values())
+# Each column selects a subset of the five cards with at least two cards in it,
+# which is every combination that can make fifteen.
+_SUBSETS = np.array([[(m >> i) & 1 for m in range(32) if bin(m).count('1') >= 2] for i in range(5)])
+_PAIRS = list(combinations(range(5), 2))
 
-def scorePeg(cards_played: List[int]) -> int:
+def scoreHandBatch(hands: np.ndarray, cuts: np.ndarray, crib: bool = False) -> np.ndarray:
+    """
+    Scores many hands at once. hands is an (N, 4) array of cards and cuts
+    holds the N matching cut cards. crib may be a single flag or an array of
+    N flags. Returns an array of N scores that match scoreHand.
+    """
+    hands = np.asarray(hands, dtype=np.int64).reshape(-1, 4)
+    cuts = np.asarray(cuts, dtype=np.int64).reshape(-1)
+    if _score_table is not None:
+        return _score_table.scoreBatch(hands, cuts, crib)
+
+    full = np.column_stack((hands, cuts))
+    ranks, suits = full % 13, full // 13
+
+    # Fifteens: sum the values in every subset of two or more cards
+    values = np.minimum(ranks + 1, 10)
+    fifteen = 2 * ((values @ _SUBSETS) == 15).sum(axis=1)
+
+    # Pairs: every pair of cards with the same rank
+    pair = 2 * sum(ranks[:, i] == ranks[:, j] for i, j in _PAIRS)
+
+    # Runs: with five cards there is at most one run of three or more, so the
+    # longest window of present ranks scores its length times the number of
+    # ways to pick one card of each rank.
+    counts = (ranks[:, :, None] == np.arange(13)).sum(axis=1)
+    run = np.zeros(len(full), dtype=np.int64)
+    for length in range(5, 2, -1):
+        windows = counts[:, :14 - length].copy()
+        for i in range(1, length):
+            windows *= counts[:, i:i + 14 - length]
+        run = np.where(run == 0, length * windows.sum(axis=1), run)
+
+    # Flush: four in the hand, five with the cut. Crib flushes need all five.
+    same_suit = (suits[:, :4] == suits[:, :1]).all(axis=1)
+    flush_cut = same_suit & (suits[:, 4] == suits[:, 0])
+    flush = np.where(crib, 5 * flush_cut, 4 * same_suit + flush_cut)
+
+    # Jack: a jack in hand matching the cut card's suit
+    jack = ((ranks[:, :4] == 10) & (suits[:, :4] == suits[:, 4:])).any(axis=1)
+
+    return fifteen + pair + run + flush + jack
+
+def scorePeg(cards_played: List[int], total: int = None) -> int:
     """
     Accepts a list of cards played and scores it according to pegging rules.
+    total is the count of the whole play, for when cards_played only holds
+    the end of it (default the sum of cards_played).
     """
     # Pegging only depends on the card, not the suit, so we can remove it.
     cards_played = [card(c) for c in cards_played]
@@ -114,6 +138,8 @@ def scorePeg(cards_played: List[int]) -> int:
                 run_points = len(current_run)
     
     # Fifteen points. Add up the value of the cards played, see if it's 15.
-    fifteen_points = 2 if sum(value(c) for c in cards_played) == 15 else 0
+    if total is None:
+        total = sum(value(c) for c in cards_played)
+    fifteen_points = 2 if total == 15 else 0
 
     return pair_points + run_points + fifteen_points
@@ -0,0 +1,293 @@
+from cribbage.strategy import Strategy
+from cribbage.strategies import strategies
+from cribbage.score import scoreHand, card
+from cribbage.io import formatCard
+from cribbage.deck import Deck, RandomDeck
+from cribbage.pegging import PeggingHistory
+from cribbage.fast_game import FastGameContext, GameResult
+from cribbage.game import PeggingContext
+from cribbage.logger import logger
+from cribbage.constants import POINT_CAP, HAND_POINTS, CRIB_POINTS, PEG_POINTS, JACK_POINTS
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, List, Sequence, Tuple
+import asyncio
+import random
+
+# Default port for serve
+PORT = 7531
+
+class Seat:
+    """
+    A Seat makes a player's decisions for async_game. It mirrors Strategy,
+    except that decisions are coroutines, so a game can wait on a person or
+    a busy strategy without holding up other games. update is told about
+    everything that happens in the game, as protocol lines (see GameServer).
+    """
+    async def chooseHand(self, options: List[int], crib: bool) -> List[int]:
+        pass
+
+    async def observeTurn(self, player: int, hand: List[int], discarded: List[int], cutCard: int):
+        pass
+
+    async def peg(self, hand: List[int], player: int, previousCards: PeggingHistory) -> int:
+        pass
+
+    def update(self, line: str):
+        pass
+
+class StrategySeat(Seat):
+    """
+    StrategySeat plays a Strategy, running each of its decisions in an
+    executor so the event loop stays free while it thinks.
+    """
+    def __init__(self, strategy: Strategy, executor: Executor = None):
+        self.strategy = strategy
+        self.executor = executor
+
+    async def _run(self, func: Callable, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def chooseHand(self, options: List[int], crib: bool) -> List[int]:
+        return await self._run(self.strategy.chooseHand, options, crib)
+
+    async def observeTurn(self, player: int, hand: List[int], discarded: List[int], cutCard: int):
+        await self._run(self.strategy.observeTurn, player, hand, discarded, cutCard)
+
+    async def peg(self, hand: List[int], player: int, previousCards: PeggingHistory) -> int:
+        return await self._run(self.strategy.peg, hand, player, previousCards)
+
+def formatCards(cards: Sequence[int]) -> str:
+    return " ".join(formatCard(c) for c in cards)
+
+class HumanSeat(Seat):
+    """
+    HumanSeat plays for a person connected by a stream. It sends them each
+    update and prompt as a line and reads their choices back, asking again
+    when a reply doesn't make sense. Waiting on a reply costs nothing but
+    the coroutine.
+    """
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    def update(self, line: str):
+        self.writer.write(f"{line}\n".encode())
+
+    async def ask(self, prompt: str, parse: Callable[[List[str]], object]):
+        """
+        Sends prompt and returns the parsed reply. parse takes the words of
+        the reply and raises ValueError or IndexError if they don't make sense.
+        A reply longer than the stream's limit ends the game.
+        """
+        while True:
+            self.update(prompt)
+            await self.writer.drain()
+            try:
+                line = await self.reader.readline()
+            except ValueError:
+                self.update("ERROR reply too long")
+                raise ConnectionError("The player sent a reply that was too long")
+            if not line:
+                raise ConnectionError("The player disconnected")
+            try:
+                return parse(line.decode().split())
+            except (ValueError, IndexError) as e:
+                self.update(f"ERROR {e}")
+
+    async def chooseHand(self, options: List[int], crib: bool) -> List[int]:
+        def _parse(words: List[str]) -> List[int]:
+            discarded = {int(word) for word in words}
+            if len(discarded) != 2 or not discarded <= set(range(len(options))):
+                raise ValueError("discard two different cards by position, like: 0 5")
+            return [c for i, c in enumerate(options) if i not in discarded]
+        return await self.ask(f"DISCARD {'YOURS' if crib else 'THEIRS'} {formatCards(options)}", _parse)
+
+    async def peg(self, hand: List[int], player: int, previousCards: PeggingHistory) -> int:
+        def _parse(words: List[str]) -> int:
+            if len(words) != 1 or not 0 <= int(words[0]) < len(hand):
+                raise ValueError("play one card by position, like: 0")
+            return hand[int(words[0])]
+        return await self.ask(f"PEG {previousCards.total} {formatCards(hand)}", _parse)
+
+class ServerGameContext(FastGameContext):
+    """
+    ServerGameContext tells both seats about every score as it happens.
+    """
+    __slots__ = ('seats',)
+
+    def __init__(self, crib: int, point_cap: int, deck: Deck, seats: Tuple[Seat, Seat]):
+        super().__init__(crib, point_cap, deck)
+        self.seats = seats
+
+    def tell(self, line: str):
+        for seat in self.seats:
+            seat.update(line)
+
+    def add_points(self, player: int, game_section: str, points: int) -> bool:
+        if points:
+            self.tell(f"POINTS {player + 1} {points} {game_section}")
+        return super().add_points(player, game_section, points)
+
+async def async_game(seat1: Seat, seat2: Seat, crib: int, point_cap: int, deck: Deck = None) -> GameResult:
+    """
+    async_game plays a game exactly like fast_game, but between Seats, and
+    returns the same GameResult. Both players choose their hands at once.
+    """
+    seats = (seat1, seat2)
+    game_context = ServerGameContext(crib, point_cap, deck or RandomDeck(), seats)
+
+    while True:
+        options1, options2, cutCard = game_context.new_turn()
+        scores = game_context.scores
+        game_context.tell(f"TURN {game_context.turns} {game_context.crib + 1} "
+                          f"{scores[0].total_points} {scores[1].total_points}")
+
+        hand1, hand2 = await asyncio.gather(
+            seat1.chooseHand(options1, 1 - game_context.crib),
+            seat2.chooseHand(options2, game_context.crib),
+        )
+        assert(all(card in options1 for card in hand1))
+        assert(all(card in options2 for card in hand2))
+        crib_hand = [card for card in options1 if card not in hand1] + [card for card in options2 if card not in hand2]
+
+        game_context.tell(f"CUT {formatCard(cutCard)}")
+        await seat1.observeTurn(0, hand1, crib_hand[:2], cutCard)
+        await seat2.observeTurn(1, hand2, crib_hand[2:], cutCard)
+        if card(cutCard) == 10 and game_context.add_points(game_context.crib, JACK_POINTS, 2):
+            break
+
+        if await async_peg(game_context, seats, [hand1.copy(), hand2.copy()]):
+            break
+
+        game_context.tell(f"SHOW 1 {formatCards(hand1)}")
+        game_context.tell(f"SHOW 2 {formatCards(hand2)}")
+        game_context.tell(f"CRIB {game_context.crib + 1} {formatCards(crib_hand)}")
+        hand_points = [
+            scoreHand(hand1, cutCard, 1 - game_context.crib),
+            scoreHand(hand2, cutCard, game_context.crib)
+        ]
+        crib_points = scoreHand(crib_hand, cutCard)
+
+        if game_context.add_points(1 - game_context.crib, HAND_POINTS, hand_points[1 - game_context.crib]) or \
+           game_context.add_points(game_context.crib, HAND_POINTS, hand_points[game_context.crib]) or \
+           game_context.add_points(game_context.crib, CRIB_POINTS, crib_points):
+            break
+
+    result = game_context.finish_game()
+    game_context.tell(f"GAMEOVER {1 if result.strat1_winner else 2} {result.strat1_total_points} {result.strat2_total_points}")
+    return result
+
+async def async_peg(game_context: ServerGameContext, seats: Sequence[Seat], hands: List[List[int]]) -> bool:
+    """
+    async_peg plays the pegging sub-game with the same rules as fast_peg.
+    """
+    pegging_context = PeggingContext(game_context.crib)
+
+    while hands[0] or hands[1]:
+        turn = pegging_context.turn
+
+        options = pegging_context.can_play(hands[turn])
+        if options:
+            card = await seats[turn].peg(options, turn, pegging_context.ctx)
+            assert(card in hands[turn])
+
+            hands[turn].remove(card)
+            pegging_context.add(card)
+            game_context.tell(f"PLAY {turn + 1} {formatCard(card)} {pegging_context.total()}")
+            if game_context.add_points(turn, PEG_POINTS, pegging_context.score()):
+                return True
+
+        if not (pegging_context.can_play(hands[0]) or pegging_context.can_play(hands[1])):
+            ctx = pegging_context.total()
+            game_context.tell(f"GO {turn + 1} {ctx}")
+            if game_context.add_points(turn, PEG_POINTS, 2 if ctx == 31 else 1):
+                return True
+
+            pegging_context.reset()
+
+        pegging_context.switch_turn()
+    return False
+
+class GameServer:
+    """
+    GameServer lets people play against any registered strategy over TCP,
+    many games at once in one process. Each connection plays one game as
+    player 1, against its own instance of the strategy it picks. Strategies
+    whose tables haven't been built aren't offered. Bot
+    decisions run in a thread pool while the event loop keeps serving the
+    other connections. The default of one thread runs one decision at a
+    time, since strategies are pure Python and some share caches.
+
+    The protocol is lines of text, each starting with a keyword. Cards are
+    written like A♥ or 10♣, and players are 1 (the person) and 2.
+    The server prompts with:
+      STRATEGY                  pick an opponent from the WELCOME line
+      DISCARD YOURS|THEIRS c*6  whose crib it is and the dealt cards; reply
+                                with the positions of two to discard, like: 0 5
+      PEG total c*              the count and the playable cards; reply with
+                                the position of the card to play, like: 0
+    A reply that doesn't make sense gets ERROR and the prompt again. The
+    server also sends WELCOME strategy*, TURN turn crib score1 score2,
+    CUT c, PLAY player c total, GO player total, POINTS player points
+    section, SHOW player c*4, CRIB player c*4 and finally GAMEOVER winner
+    score1 score2, after which it closes the connection.
+    """
+    def __init__(self, point_cap: int = POINT_CAP, workers: int = 1,
+                 on_result: Callable[[str, GameResult], None] = None):
+        self.point_cap = point_cap
+        self.executor = ThreadPoolExecutor(workers)
+        self.on_result = on_result
+        self.games = 0
+        self._names = None
+
+    def names(self) -> List[str]:
+        """
+        Returns the strategies that can play without a person and have their
+        tables built, found once by having each choose a hand.
+        """
+        if self._names is None:
+            self._names = []
+            for name in strategies:
+                factory, args = strategies.factory(name)
+                if getattr(factory, 'interactive', False):
+                    continue
+                try:
+                    factory(*args).chooseHand(list(range(6)), True)
+                except FileNotFoundError as e:
+                    logger.warning(f"Not offering {name}: {e}")
+                    continue
+                self._names.append(name)
+        return self._names
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        human = HumanSeat(reader, writer)
+        names = self.names()
+        def _parse(words: List[str]) -> str:
+            if len(words) != 1 or words[0] not in names:
+                raise ValueError(f"choose one of {' '.join(names)}")
+            return words[0]
+        self.games += 1
+        try:
+            human.update(f"WELCOME {' '.join(names)}")
+            name = await human.ask("STRATEGY", _parse)
+            factory, args = strategies.factory(name)
+            bot = StrategySeat(factory(*args), self.executor)
+            result = await async_game(human, bot, random.randrange(2), self.point_cap)
+            await writer.drain()
+            if self.on_result is not None:
+                self.on_result(name, result)
+        except ConnectionError as e:
+            logger.info(f"Game abandoned: {e}")
+        except FileNotFoundError as e:
+            # A table went missing after names was found
+            logger.warning(f"Game abandoned: {e}")
+            human.update(f"ERROR {name} can't play without its tables")
+        finally:
+            self.games -= 1
+            writer.close()
+
+    async def serve(self, host: str = '127.0.0.1', port: int = PORT):
+        server = await asyncio.start_server(self.handle, host, port)
+        logger.warning(f"Serving cribbage on {', '.join(str(s.getsockname()[:2]) for s in server.sockets)}")
+        async with server:
+            await server.serve_forever()
@@ -1,32 +1,300 @@
 from cribbage.strategy import Strategy
 from cribbage.game import game
-from cribbage.constants import POINT_CAP
-from cribbage.deck import RandomDeck
-from cribbage.score import scoreHand
+from cribbage.fast_game import fast_game
+from cribbage.constants import POINT_CAP, CRIB, PAIR, SHARD_SIZE
+from cribbage.deck import BlockDeck, BLOCK_TURNS
+from cribbage.score import scoreHandBatch, useScoreTable
+from cribbage.analysis import StoppingRule, HandHistogram
+from cribbage.profiler import Profiler
+from cribbage.checkpoint import Checkpoint
+from cribbage.canonical import canonical_deals, relabelings
+from cribbage.hand import Hand
+from cribbage.logger import logger
+from cribbage import score
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from collections import deque
+from contextlib import contextmanager
+from functools import partial
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Tuple
+import random
+import numpy as np
 import pandas as pd
 
-def simulate(strat1: Strategy, strat2: Strategy, games: int, point_cap: int=POINT_CAP) -> pd.DataFrame:
+def shards(iterations: int, shard_size: int = SHARD_SIZE) -> List[Tuple[int, int]]:
+    """
+    Splits range(iterations) into (start, stop) shards of at most shard_size.
+    """
+    return [(start, min(start + shard_size, iterations)) for start in range(0, iterations, shard_size)]
+
+def seed_shard(seed: int, start: int, stop: int, turns: int = BLOCK_TURNS) -> BlockDeck:
+    """
+    Derives independent random states for the shard from start to stop. The
+    global random state (used by strategies) is seeded in place and a
+    BlockDeck with turns deals for every game is returned. The deals don't
+    depend on the strategies, so runs with the same seed and shard size deal
+    the same cards to any pair of strategies.
+    """
+    seed_strategies(seed, start)
+    return BlockDeck(seed, start, stop, turns)
+
+def seed_strategies(seed: int, start: int):
+    """
+    Seeds the global random state, which strategies use, for the shard
+    starting at start.
+    """
+    strategy_seed, = np.random.SeedSequence(seed, spawn_key=(start,)).generate_state(1)
+    random.seed(int(strategy_seed))
+
+@contextmanager
+def preserved_random_state():
+    """
+    Puts the global random state back as it was on exit, so shards seeded
+    in this process don't change the caller's random numbers.
+    """
+    state = random.getstate()
+    try:
+        yield
+    finally:
+        random.setstate(state)
+
+def _init_worker(table, level: int):
+    # Workers score like this process and log at its level
+    useScoreTable(table)
+    logger.setLevel(level)
+
+def run_shards(func: Callable, work: Iterable, workers: int = 1, ordered: bool = True) -> Iterator:
+    """
+    Applies func to each unit of work, in a process pool if workers > 1, and
+    yields the results in order. Only a few shards per worker are in flight
+    at once, so results don't pile up in memory. Workers use the same score
+    table and log level as this process.
+    Without ordered, all the work is submitted at once and results are
+    yielded as they finish, so a slow unit never holds up the rest. That
+    suits small results whose order doesn't matter.
+    Shards run in this process leave the global random state as it was.
+    """
+    if workers <= 1:
+        for w in work:
+            with preserved_random_state():
+                result = func(w)
+            yield result
+        return
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(score._score_table, logger.level)) as executor:
+        if not ordered:
+            futures = [executor.submit(func, w) for w in work]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+            return
+        pending = deque()
+        try:
+            for w in work:
+                pending.append(executor.submit(func, w))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # If the results stop being read, don't wait for the rest
+            for future in pending:
+                future.cancel()
+
+def new_seed() -> int:
+    return np.random.SeedSequence().entropy
+
+def _as_dict(result) -> dict:
+    # Results are a GameResult from fast_game or a Series from game
+    return result._asdict() if hasattr(result, '_asdict') else result.to_dict()
+
+def _swap_seats(result) -> dict:
+    # A game played with the strategies in each other's seats, as if they
+    # were in their own: strat1 and strat2 columns trade places
+    values = _as_dict(result)
+    swapped = {}
+    for key, value in values.items():
+        if key.startswith('strat1_'):
+            value = values['strat2_' + key[len('strat1_'):]]
+        elif key.startswith('strat2_'):
+            value = values['strat1_' + key[len('strat2_'):]]
+        elif key == CRIB:
+            value = 1 - value
+        swapped[key] = value
+    return swapped
+
+def _duplicate_game(play: Callable, strat1: Strategy, strat2: Strategy, point_cap: int, deck: BlockDeck,
+                    game_number: int) -> dict:
+    # Both games of a pair replay the first game's deals, and the same seat
+    # starts with the crib, so each strategy plays the other's cards once
+    pair, swapped = divmod(game_number, 2)
+    deals = deck.game(game_number - swapped)
+    if swapped:
+        result = _swap_seats(play(strat2, strat1, pair % 2, point_cap, deals))
+    else:
+        result = _as_dict(play(strat1, strat2, pair % 2, point_cap, deals))
+    result[PAIR] = pair
+    return result
+
+def _simulate_shard(strat1: Strategy, strat2: Strategy, point_cap: int, seed: int, fast: bool,
+                    duplicate: bool, profile: bool, shard: Tuple[int, int]):
+    start, stop = shard
+    deck = seed_shard(seed, start, stop)
+    play = fast_game if fast else game
+    profiler = Profiler() if profile else None
+    if profiler:
+        strat1, strat2 = profiler.strategy(strat1, 'strat1'), profiler.strategy(strat2, 'strat2')
+        deck, play = profiler.deck(deck), profiler.timed('game', partial(play, profiler=profiler))
+    if duplicate:
+        games = [_duplicate_game(play, strat1, strat2, point_cap, deck, game_number) for game_number in range(start, stop)]
+    else:
+        games = [play(strat1, strat2, game_number % 2, point_cap, deck.game(game_number)) for game_number in range(start, stop)]
+    df = pd.DataFrame(games, index=range(start, stop))
+    return (df, profiler) if profiler else df
+
+def simulateChunks(strat1: Strategy, strat2: Strategy, games: int, point_cap: int=POINT_CAP,
+                   workers: int = 1, seed: int = None, shard_size: int = SHARD_SIZE,
+                   fast: bool = False, stop: StoppingRule = None, duplicate: bool = False,
+                   profiler: Profiler = None, checkpoint: Checkpoint = None) -> Iterator[pd.DataFrame]:
+    """
+    simulateChunks plays the same games as simulate, but yields them one
+    shard at a time as DataFrames indexed by game number. Given a stopping
+    rule, games becomes the most that are played: each shard updates the
+    rule and no more shards are played once it has decided. Shards come
+    back in order, so the same seed stops after the same games.
+    Given a profiler, every shard is profiled and merged into it.
+    Given a checkpoint, each shard is saved to it once played, and shards
+    it already has are loaded instead of played again (and not profiled).
+    Every shard is still yielded, so a resumed run yields the same chunks
+    as one that was never interrupted.
+    """
+    if duplicate and (games % 2 or shard_size % 2):
+        raise ValueError("Duplicate games are played in pairs, so games and shard_size must be even")
+    seed = new_seed() if seed is None else seed
+    work = shards(games, shard_size)
+    completed = checkpoint.completed() if checkpoint is not None else set()
+    profile = profiler is not None
+    play = partial(_simulate_shard, strat1, strat2, point_cap, seed, fast, duplicate, profile)
+    chunks = run_shards(play, (shard for shard in work if shard not in completed), workers)
+    for shard in work:
+        if shard in completed:
+            chunk = checkpoint.load(shard)
+        else:
+            chunk = next(chunks)
+            if profile:
+                chunk, shard_profiler = chunk
+                profiler.merge(shard_profiler)
+            if checkpoint is not None:
+                checkpoint.save(shard, chunk)
+        yield chunk
+        if stop is not None and stop.update(chunk).decided():
+            chunks.close()
+            return
+
+def simulate(strat1: Strategy, strat2: Strategy, games: int, point_cap: int=POINT_CAP,
+             workers: int = 1, seed: int = None, shard_size: int = SHARD_SIZE, fast: bool = False,
+             stop: StoppingRule = None, duplicate: bool = False, profiler: Profiler = None) -> pd.DataFrame:
     """
     The simulate function pits two strategies against each other. The two
     strategies will play the specified number of games up to the specified
     point cap, taking turns starting with the crib. Simulate returns a pandas
     DataFrame containing the result of each game.
+    Games are split into shards that run across workers processes. Each shard
+    is seeded from seed, so the same seed always gives the same games.
+    With fast, games are played by the fast_game engine instead, which gives
+    identical results with less overhead.
+    With a stopping rule, games is the most that are played and fewer are
+    played once the rule has decided (see simulateChunks).
+    With duplicate, games are played in pairs on the same deals with the
+    strategies swapping seats, so each strategy plays both sides of every
+    deal. Columns still refer to strat1 and strat2 (and crib_start to the
+    strategy, not the seat) and the pair column holds each game's pair,
+    which analyze_game uses for paired differences that leave out most of
+    the luck of the cards.
+    Given a profiler, the time spent in each phase of the games is added to
+    it (see Profiler).
+    """
+    results = list(simulateChunks(strat1, strat2, games, point_cap, workers, seed, shard_size, fast, stop, duplicate,
+                                  profiler))
+    return pd.concat(results) if results else pd.DataFrame()
+
+def _hand_choice_shard(strat: Strategy, seed: int, shard: Tuple[int, int]) -> pd.DataFrame:
+    start, stop = shard
+    # Each hand is one turn, so there's no need to deal a whole game
+    deck = seed_shard(seed, start, stop, turns=1)
+    hands = [f'hand_{i+1}' for i in range(4)]
+    fields = hands + ['discarded_1', 'discarded_2', 'cutCard', 'crib']
+    def _choose(i: int) -> List[int]:
+        crib = i % 2
+        hand, _, cutCard = deck.game(i).deal()
+        options = strat.chooseHand(hand, crib)
+        discarded = [c for c in hand if c not in options]
+        return options + discarded + [cutCard, crib]
+    df = pd.DataFrame([_choose(i) for i in range(start, stop)], columns=fields, index=range(start, stop))
+    df['score'] = scoreHandBatch(df[hands].values, df['cutCard'].values)
+    return df
+
+def simulateHandChoiceChunks(strat: Strategy, iterations: int, workers: int = 1, seed: int = None,
+                             shard_size: int = SHARD_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    simulateHandChoiceChunks deals the same hands as simulateHandChoice, but
+    yields them one shard at a time.
     """
-    return pd.DataFrame(game(strat1, strat2, game_number % 2, point_cap) for game_number in range(games))
+    seed = new_seed() if seed is None else seed
+    work = shards(iterations, shard_size)
+    yield from run_shards(partial(_hand_choice_shard, strat, seed), work, workers)
 
-def simulateHandChoice(strat: Strategy, iterations: int) -> pd.DataFrame:
+def simulateHandChoice(strat: Strategy, iterations: int, workers: int = 1, seed: int = None,
+                       shard_size: int = SHARD_SIZE) -> pd.DataFrame:
     """
     The simulateHandChoice function evaluates how a chosen strategy peforms
     by dealing several hands and scoring them based on the cut card. It returns
     a pandas DataFrame with the chosen hand, discarded cards, cut card, and the
     score of each hand. Points in the crib are not accounted for here because
     those depend on the choices from another strategy.
+    Sharding and seeding work the same way as in simulate.
     """
-    deck = RandomDeck()
-    fields = [f'hand_{i+1}' for i in range(4)] + ['discarded_1', 'discarded_2', 'cutCard', 'crib', 'score']
-    def _score(crib: bool) -> pd.Series:
-        hand, _, cutCard = deck.deal()
-        options = strat.chooseHand(hand, crib)
-        discarded = [c for c in hand if c not in options]
-        return pd.Series(options + discarded + [cutCard, crib, scoreHand(options, cutCard)], index=fields)
-    return pd.DataFrame(_score(i % 2) for i in range(iterations))
+    results = list(simulateHandChoiceChunks(strat, iterations, workers, seed, shard_size))
+    return pd.concat(results) if results else pd.DataFrame()
+
+def _exact_hand_choice_shard(strat: Strategy, deals: List[Tuple[Tuple[int], int]]) -> HandHistogram:
+    hands, cuts, cribs, weights = [], [], [], []
+    # Strategies that might choose differently on relabeled deals play every
+    # one of them instead of standing in with the canonical deal
+    if not strat.suit_invariant:
+        deals = [(deal, 1) for cards, _ in deals for deal in relabelings(cards)]
+    for cards, multiplicity in deals:
+        dealt = Hand(cards)
+        remaining = [c for c in range(52) if c not in dealt]
+        for crib in (0, 1):
+            hand = strat.chooseHand(list(cards), crib)
+            hands += [hand] * len(remaining)
+            cuts += remaining
+            cribs += [crib] * len(remaining)
+            weights += [multiplicity] * len(remaining)
+    df = pd.DataFrame({'crib': cribs, 'weight': weights})
+    df['score'] = scoreHandBatch(np.array(hands), np.array(cuts))
+    return HandHistogram().update(df)
+
+def exactHandChoice(strat: Strategy, workers: int = 1, shard_size: int = SHARD_SIZE) -> HandHistogram:
+    """
+    exactHandChoice scores a strategy's hands over every possible deal
+    instead of a sample: each deal is chosen from with and without the crib
+    and scored with every cut card. The HandHistogram it returns holds the
+    exact distribution that simulateHandChoice samples, with every deal and
+    cut counted, so each half holds C(52, 6) * 46 hands.
+    Deals are handed out by canonical form (see canonical_deals). For suit
+    invariant strategies, like the *_table strategies, the canonical deal
+    is counted once for each deal it stands for. Other strategies can break
+    ties differently on relabeled deals, so they play every deal, which
+    takes about 20 times as long.
+    """
+    deals = canonical_deals()
+    work = iter(lambda: list(islice(deals, shard_size)), [])
+    histogram = HandHistogram()
+    for shard_histogram in run_shards(partial(_exact_hand_choice_shard, strat), work, workers):
+        histogram.merge(shard_histogram)
+    return histogram
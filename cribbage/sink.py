@@ -0,0 +1,70 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+class Sink:
+    """
+    A sink receives results one chunk at a time and appends them to a file,
+    so results reach the disk as a run progresses and only one chunk is held
+    in memory. Sinks are context managers and close their file on exit.
+    """
+    extension = ''
+
+    def __init__(self, path: str):
+        self.path = f'{path}.{self.extension}'
+
+    def write(self, chunk: 'pd.DataFrame'):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self) -> 'Sink':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class CSVSink(Sink):
+    """
+    CSVSink writes the header with the first chunk and appends the rest.
+    """
+    extension = 'csv'
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.header = True
+
+    def write(self, chunk: 'pd.DataFrame'):
+        chunk.to_csv(self.path, mode='w' if self.header else 'a', header=self.header)
+        self.header = False
+
+class ParquetSink(Sink):
+    """
+    ParquetSink writes each chunk as a row group of a single Parquet file.
+    It requires pyarrow (pip install cribbage[parquet]).
+    """
+    extension = 'parquet'
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.writer = None
+
+    def write(self, chunk: 'pd.DataFrame'):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(chunk)
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+sinks = {
+    'csv': CSVSink,
+    'parquet': ParquetSink,
+}
@@ -1,14 +1,42 @@
-from .random import *
-from .first import *
-from .human import *
-from .hand_score import *
-from .brute_force import *
-
-strategies = {
-    'random': RandomStrategy(),
-    'first': FirstStrategy(),
-    'human': HumanStrategy(),
-    'expected_value': ExpectedValue(),
-    'maximize_ceiling': MaximizeCeiling(),
-    'maximize_floor': MaximizeFloor(),
+from importlib import import_module
+from .registry import StrategyRegistry
+
+# The module each strategy class is defined in. Classes are imported the
+# first time they're used, so importing this package stays cheap.
+CLASSES = {
+    'RandomStrategy': 'random',
+    'FirstStrategy': 'first',
+    'HumanStrategy': 'human',
+    'HandScore': 'hand_score',
+    'BruteForce': 'brute_force',
+    'ExpectedValue': 'brute_force',
+    'MaximizeCeiling': 'brute_force',
+    'MaximizeFloor': 'brute_force',
+    'TableStrategy': 'table',
+    'CribExpectedValue': 'table',
+    'Expectimax': 'expectimax',
+    'ISMCTS': 'ismcts',
 }
+
+def __getattr__(name: str):
+    if name in CLASSES:
+        return getattr(import_module(f'{__name__}.{CLASSES[name]}'), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + list(CLASSES))
+
+strategies = StrategyRegistry({
+    'random': ('RandomStrategy',),
+    'first': ('FirstStrategy',),
+    'human': ('HumanStrategy',),
+    'expected_value': ('ExpectedValue',),
+    'maximize_ceiling': ('MaximizeCeiling',),
+    'maximize_floor': ('MaximizeFloor',),
+    'expected_value_table': ('TableStrategy', 'expected_value'),
+    'maximize_ceiling_table': ('TableStrategy', 'maximize_ceiling'),
+    'maximize_floor_table': ('TableStrategy', 'maximize_floor'),
+    'crib_expected_value': ('CribExpectedValue',),
+    'expectimax': ('Expectimax',),
+    'ismcts': ('ISMCTS',),
+})
@@ -1,7 +1,10 @@
 from cribbage.strategies import HandScore
-from cribbage.score import scoreHand
+from cribbage.score import scoreHandBatch
+from cribbage.canonical import canonical_key
+from cribbage.cache import LRUCache
+from cribbage.hand import Hand
 
-from typing import List
+from typing import List, Tuple
 from statistics import mean
 
 class BruteForce(HandScore):
@@ -9,10 +12,29 @@ class BruteForce(HandScore):
     The BruteForce strategy implements scoring by running through each possible
     cut card and scoring the resulting hand. Base classes differ in how they
     select a hand to choose.
+    Scores are cached by the suit-normalized hand and discards, since deals
+    that only differ by suit have the same scores. The cache is shared by all
+    brute force strategies; check BruteForce.cache for hits and misses.
     """
-    def getScores(self, hand: List[int], discarded: List[int], crib: bool) -> List[int]:
-        return [scoreHand(hand, cutCard) for cutCard in range(52) \
-            if cutCard not in hand and cutCard not in discarded]
+    cache = LRUCache(2 ** 16)
+
+    def getScores(self, hand: List[int], discarded: List[int], crib: bool) -> Tuple[int, ...]:
+        """
+        The hand's score with each possible cut. Deals that only differ by
+        suit share an entry, so the scores are in cut order for the first of
+        them that was scored, not necessarily for hand: only the
+        distribution of scores is meaningful.
+        """
+        # The hand is scored without the crib flag, so it's left out of the key
+        return self.cache.get(canonical_key(hand, discarded), lambda: self.computeScores(hand, discarded))
+
+    def computeScores(self, hand: List[int], discarded: List[int]) -> Tuple[int, ...]:
+        """
+        The hand's score with each card not dealt as the cut, in card order.
+        """
+        dealt = Hand(hand + discarded)
+        cuts = [cutCard for cutCard in range(52) if cutCard not in dealt]
+        return tuple(scoreHandBatch([hand] * len(cuts), cuts).tolist())
 
 class ExpectedValue(BruteForce):
     """
@@ -37,4 +59,3 @@ class MaximizeFloor(BruteForce):
     """
     def score(self, hand: List[int], discarded: List[int], crib: bool) -> int:
         return min(self.getScores(hand, discarded, crib))
-            
\ No newline at end of file
@@ -0,0 +1,160 @@
+from cribbage.strategies import ExpectedValue
+from cribbage.cache import LRUCache
+from cribbage.score import card, scorePeg
+from cribbage.constants import PEG_CAP
+from cribbage.pegging import PeggingHistory
+
+from math import comb
+from typing import List, Tuple
+
+ME, OPPONENT = 0, 1
+VALUES = [min(rank + 1, 10) for rank in range(13)]
+
+def pack(ranks) -> int:
+    """
+    Packs a collection of ranks into an integer with 3 bits per rank holding
+    how many cards of that rank there are.
+    """
+    return sum(1 << 3 * rank for rank in ranks)
+
+def count(packed: int, rank: int) -> int:
+    return (packed >> 3 * rank) & 7
+
+def relevant(sequence: Tuple[int]) -> Tuple[int]:
+    """
+    Trims a pegging sequence to the part that can still score pairs and
+    runs: the cards since the last repeated rank, or the run of matching
+    ranks at the end. Fifteens need the total, which is kept separately.
+    """
+    if len(sequence) > 1 and sequence[-1] == sequence[-2]:
+        streak = 2
+        while streak < len(sequence) and sequence[-streak - 1] == sequence[-1]:
+            streak += 1
+        return sequence[-streak:]
+    seen = set()
+    for i in range(len(sequence) - 1, -1, -1):
+        if sequence[i] in seen:
+            return sequence[i + 1:]
+        seen.add(sequence[i])
+    return sequence
+
+class Expectimax(ExpectedValue):
+    """
+    Expectimax chooses its hand like ExpectedValue and pegs by searching the
+    next depth cards played. It plays the card with the best expected
+    difference in pegging points, modelling the opponent as playing a random
+    card from the ones it can't see (accounting for its own cards, discards,
+    the cut and everything played). Searched states are kept in a
+    transposition table, so states reached again later in the hand are free.
+    States don't include the score: values are the points still to come.
+    """
+    def __init__(self, depth: int = 4, cache_size: int = 2 ** 18):
+        self.depth = depth
+        self.table = LRUCache(cache_size)
+        self.turns = {}
+
+    def observeTurn(self, player: int, hand: List[int], discarded: List[int], cutCard: int):
+        self.turns[player] = (hand, discarded, cutCard)
+
+    def peg(self, hand: List[int], player: int, previousCards: PeggingHistory) -> int:
+        played = previousCards.played_by(player)
+        kept, discarded, cutCard = self.turns.get(player, (hand, [], None))
+        remaining = [c for c in kept if c not in played]
+        if not all(c in remaining for c in hand):
+            # Nothing was observed for this hand, so only the options are known
+            remaining, discarded, cutCard = hand, [], None
+        # The pool is every rank less what's been played and what we hold
+        unplayed = pack(card(c) for c in remaining + discarded + ([] if cutCard is None else [cutCard]))
+        pool = sum((4 - played_ranks - count(unplayed, rank)) << 3 * rank
+                   for rank, played_ranks in enumerate(previousCards.rank_counts()))
+
+        mine = pack(card(c) for c in remaining)
+        opponent = 4 - len(previousCards.played_by(1 - player))
+        sequence = relevant(tuple(card(c) for c in previousCards.sequence()))
+
+        best = max({card(c) for c in hand}, key=lambda rank: \
+            self.play(mine, pool, opponent, previousCards.total, sequence, rank, self.depth))
+        return next(c for c in hand if card(c) == best)
+
+    def play(self, mine: int, pool: int, opponent: int, total: int, sequence: Tuple[int], rank: int, depth: int) -> float:
+        """
+        The value of playing a card of the given rank from mine.
+        """
+        sequence += (rank,)
+        total += VALUES[rank]
+        # sequence is trimmed, so fifteens come from the total
+        points = scorePeg(list(sequence), total)
+        return points + self.after(ME, mine - (1 << 3 * rank), pool, opponent, total, relevant(sequence), depth - 1)
+
+    def mine(self, mine: int, pool: int, opponent: int, total: int, sequence: Tuple[int], depth: int) -> float:
+        """
+        The value of a state where it's our turn and we can play.
+        """
+        return self.table.get(('mine', mine, pool, opponent, total, sequence, depth), lambda: max(
+            self.play(mine, pool, opponent, total, sequence, rank, depth)
+            for rank in range(13) if count(mine, rank) and total + VALUES[rank] <= PEG_CAP
+        ))
+
+    def theirs(self, mine: int, pool: int, opponent: int, total: int, sequence: Tuple[int], depth: int) -> float:
+        """
+        The expected value of a state where the opponent plays, given that
+        they can. Each card they might hold is equally likely to be played.
+        """
+        def _value():
+            playable = [rank for rank in range(13) if count(pool, rank) and total + VALUES[rank] <= PEG_CAP]
+            cards = sum(count(pool, rank) for rank in playable)
+            value = 0
+            for rank in playable:
+                played = sequence + (rank,)
+                points = scorePeg(list(played), total + VALUES[rank])
+                rest = self.after(OPPONENT, mine, pool - (1 << 3 * rank), opponent - 1, total + VALUES[rank],
+                                  relevant(played), depth - 1)
+                value += count(pool, rank) / cards * (rest - points)
+            return value
+        return self.table.get(('theirs', mine, pool, opponent, total, sequence, depth), _value)
+
+    def after(self, player: int, mine: int, pool: int, opponent: int, total: int, sequence: Tuple[int], depth: int) -> float:
+        """
+        The value of the state after player has played, following the order
+        of game.peg: the other player plays if they can, then the same player,
+        and if neither can the player who played last gets a go. Once depth
+        cards have been played, the rest of the hand counts as even.
+        """
+        can_play = any(count(mine, rank) and total + VALUES[rank] <= PEG_CAP for rank in range(13))
+        chance = self.chance(pool, opponent, total)
+        go = 2 if total == PEG_CAP else 1
+
+        if player == OPPONENT and can_play:
+            return self.mine(mine, pool, opponent, total, sequence, depth) if depth else 0
+        if player == ME:
+            stuck = (self.mine(mine, pool, opponent, total, sequence, depth) if depth else 0) if can_play else \
+                go + self.lead(OPPONENT, mine, pool, opponent, depth)
+        else:
+            stuck = self.lead(ME, mine, pool, opponent, depth) - go
+
+        value = (1 - chance) * stuck if chance < 1 else 0
+        if chance and depth:
+            value += chance * self.theirs(mine, pool, opponent, total, sequence, depth)
+        return value
+
+    def lead(self, player: int, mine: int, pool: int, opponent: int, depth: int) -> float:
+        """
+        The value of starting a new count with player to play first.
+        """
+        if not depth or (not mine and not opponent):
+            return 0
+        if (player == ME and mine) or not opponent:
+            return self.mine(mine, pool, opponent, 0, (), depth)
+        return self.theirs(mine, pool, opponent, 0, (), depth)
+
+    @staticmethod
+    def chance(pool: int, opponent: int, total: int) -> float:
+        """
+        The probability that the opponent's cards, drawn from pool, include
+        one that can be played.
+        """
+        if not opponent:
+            return 0
+        unseen = sum(count(pool, rank) for rank in range(13))
+        blocked = sum(count(pool, rank) for rank in range(13) if total + VALUES[rank] > PEG_CAP)
+        return 1 - comb(blocked, opponent) / comb(unseen, opponent)
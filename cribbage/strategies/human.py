@@ -7,6 +7,7 @@ class HumanStrategy(Strategy):
     HumanStrategy implements an interactive strategy that allows a person to
     select pegging and hand cards using IO inputs
     """
+    interactive = True
 
     def chooseHand(self, options: List[int], crib: bool) -> List[int]:
         print(f"It is {'' if crib else ' not'} your crib.")
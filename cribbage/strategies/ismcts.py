@@ -0,0 +1,233 @@
+from cribbage.strategy import Strategy
+from cribbage.game import PeggingContext
+from cribbage.cache import LRUCache
+from cribbage.canonical import canonical_suits, relabel
+from cribbage.score import scoreHandBatch
+from cribbage.hand import Hand
+from cribbage.pegging import PeggingHistory
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from math import log, sqrt
+from typing import Callable, Dict, List, Tuple
+import random
+import time
+import numpy as np
+
+# The positions of the two discarded cards, one arm per choice
+DISCARDS = list(combinations(range(6), 2))
+
+# Determinizations scored together by one chooseHand iteration
+BATCH_SIZE = 16
+
+def _deadline(time_budget: float) -> float:
+    return float('inf') if time_budget is None else time.perf_counter() + time_budget
+
+def _until(deadline: float, func: Callable, *args):
+    # Runs a search in a worker with what's left of the time budget when it
+    # starts, so starting the pool counts against the budget
+    *args, iterations, exploration = args
+    return func(*args, iterations, None if deadline is None else max(deadline - time.time(), 0), exploration)
+
+def _ucb(visits: int, total: float, parent: int, exploration: float) -> float:
+    return total / visits + exploration * sqrt(log(parent) / visits)
+
+def search_discards(cards: List[int], crib: bool, deals: np.ndarray, iterations: int, time_budget: float,
+                    exploration: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Runs a UCB1 bandit over the 15 ways of discarding from cards. Each pull
+    scores the chosen discard against BATCH_SIZE rows of deals (the
+    opponent's two discards and the cut) for the hand plus or minus the crib.
+    Returns the number of determinizations and total points for each arm.
+    """
+    deadline = _deadline(time_budget)
+    cards = np.array(cards)
+    kept = np.array([[c for i, c in enumerate(cards) if i not in arm] for arm in DISCARDS])
+    discarded = cards[np.array(DISCARDS)]
+    counts, totals = np.zeros(len(DISCARDS)), np.zeros(len(DISCARDS))
+
+    row, pulls = 0, 0
+    while row < iterations and time.perf_counter() < deadline:
+        if pulls < len(DISCARDS):
+            arm = pulls
+        else:
+            arm = int(np.argmax(totals / counts + exploration * np.sqrt(np.log(pulls) / (counts / BATCH_SIZE))))
+        batch = deals[np.arange(row, row + BATCH_SIZE) % len(deals)]
+        cuts = batch[:, 2]
+        hand = scoreHandBatch(np.tile(kept[arm], (BATCH_SIZE, 1)), cuts)
+        crib_hand = scoreHandBatch(np.column_stack((np.tile(discarded[arm], (BATCH_SIZE, 1)), batch[:, :2])), cuts, crib=True)
+        counts[arm] += BATCH_SIZE
+        totals[arm] += (hand + (crib_hand if crib else -crib_hand)).sum()
+        row += BATCH_SIZE
+        pulls += 1
+    return counts, totals
+
+def search_pegging(mine: List[int], player: int, sequence: List[int], seed: int, deals: np.ndarray,
+                   iterations: int, time_budget: float, exploration: float) -> Dict[int, List[float]]:
+    """
+    Runs single observer ISMCTS over the rest of the pegging, with player to
+    play from mine after the cards in the current sequence. Each
+    iteration gives the opponent the cards in one row of deals, walks the
+    shared tree choosing
+    among the cards available in that determinization by UCB (with
+    availability counts), adds one node and plays out at random. Rewards are
+    player's pegging points minus the opponent's. Returns the visits, total
+    reward and availability of each card player can play now.
+    """
+    deadline = _deadline(time_budget)
+    rng = random.Random(seed)
+    tree = {}
+
+    iteration = 0
+    while iteration < iterations and time.perf_counter() < deadline:
+        context = PeggingContext(0)
+        for c in sequence:
+            context.add(c)
+        context.turn = player
+        hands = [None, None]
+        hands[player] = list(mine)
+        hands[1 - player] = [int(c) for c in deals[iteration % len(deals)]]
+
+        path, visited, reward = (), [], 0
+        expanding = True
+        while hands[0] or hands[1]:
+            turn = context.turn
+            sign = 1 if turn == player else -1
+            options = context.can_play(hands[turn])
+            if options:
+                if expanding:
+                    stats = tree.setdefault(path, {})
+                    for c in options:
+                        stats.setdefault(c, [0, 0.0, 0])[2] += 1
+                    untried = [c for c in options if not stats[c][0]]
+                    if untried:
+                        c = rng.choice(untried)
+                        expanding = False
+                    else:
+                        c = max(options, key=lambda c: _ucb(stats[c][0], sign * stats[c][1], stats[c][2], exploration))
+                    visited.append(stats[c])
+                    path += (c,)
+                else:
+                    c = rng.choice(options)
+                hands[turn].remove(c)
+                context.add(c)
+                reward += sign * context.score()
+
+            if not (context.can_play(hands[0]) or context.can_play(hands[1])):
+                reward += sign * (2 if context.total() == 31 else 1)
+                context.reset()
+            context.switch_turn()
+
+        # Totals are kept from player's point of view
+        for stats in visited:
+            stats[0] += 1
+            stats[1] += reward
+        iteration += 1
+    return tree.get((), {})
+
+class ISMCTS(Strategy):
+    """
+    ISMCTS searches both decisions by sampling the cards it can't see.
+    chooseHand is a bandit over the discards, scoring each against sampled
+    opponent discards and cuts. peg runs information set Monte Carlo tree
+    search over the rest of the pegging, with the opponent holding a sample
+    of the unseen cards. Each decision stops after iterations
+    determinizations or time_budget seconds, whichever comes first (the
+    time includes starting the pool).
+    With workers > 1, each decision is split across a process pool, every
+    worker searching its own tree over different samples (the results are
+    added up). Determinizations are dealt in blocks of samples and cached by
+    information set, so a repeated information set isn't dealt again: hands
+    are cached up to relabeling suits. Each block is seeded from seed and
+    the information set rather than the global random state, so whether it
+    was cached (which depends on the games a process played before) never
+    changes the games that follow. close shuts down the pool.
+    """
+    def __init__(self, iterations: int = 1000, time_budget: float = None, workers: int = 1,
+                 exploration: float = 2.0, samples: int = 1024, cache_size: int = 2 ** 10, seed: int = 0):
+        self.iterations = iterations if iterations is not None else float('inf')
+        self.time_budget = time_budget
+        self.workers = workers
+        self.exploration = exploration
+        self.samples = samples
+        self.seed = seed
+        self.deals = LRUCache(cache_size)
+        self.turns = {}
+        self._executor = None
+
+    def __getstate__(self):
+        # Neither the pool nor the cached deals need to go to other processes
+        state = self.__dict__.copy()
+        state['_executor'] = None
+        state['deals'] = LRUCache(self.deals.maxsize)
+        return state
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __del__(self):
+        self.close()
+
+    def determinizations(self, known: Tuple[int], size: int) -> np.ndarray:
+        """
+        Returns samples rows of size cards drawn without replacement from the
+        cards not in known. Rows only depend on seed, known and size, and
+        are cached by (known, size).
+        """
+        def _deal():
+            dealt = Hand(known)
+            unseen = np.array([c for c in range(52) if c not in dealt])
+            rng = np.random.default_rng(np.random.SeedSequence([self.seed, size, *known]))
+            return unseen[np.argsort(rng.random((self.samples, len(unseen))), axis=1)[:, :size]]
+        return self.deals.get((known, size), _deal)
+
+    def _search(self, func, *args) -> list:
+        # Runs func with the search budget, in a pool if there are workers.
+        # The last argument is the determinizations, which are rotated so
+        # that each worker starts on different ones.
+        *args, deals = args
+        if self.workers <= 1:
+            return [func(*args, deals, self.iterations, self.time_budget, self.exploration)]
+        deadline = None if self.time_budget is None else time.time() + self.time_budget
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers)
+        iterations = -(-self.iterations // self.workers) if self.iterations != float('inf') else self.iterations
+        futures = [
+            self._executor.submit(_until, deadline, func, *args,
+                                  np.roll(deals, -w * len(deals) // self.workers, axis=0), iterations, self.exploration)
+            for w in range(self.workers)
+        ]
+        return [future.result() for future in futures]
+
+    def chooseHand(self, options: List[int], crib: bool) -> List[int]:
+        # Search in canonical suits so hands that only differ by suit share deals
+        cards = relabel(options, canonical_suits(options))
+        deals = self.determinizations(tuple(sorted(cards)), 3)
+        results = self._search(search_discards, cards, crib, deals)
+        counts = sum(c for c, _ in results)
+        totals = sum(t for _, t in results)
+        arm = DISCARDS[int(np.argmax(totals / np.maximum(counts, 1)))]
+        return [c for i, c in enumerate(options) if i not in arm]
+
+    def observeTurn(self, player: int, hand: List[int], discarded: List[int], cutCard: int):
+        self.turns[player] = (hand, discarded, cutCard)
+
+    def peg(self, hand: List[int], player: int, previousCards: PeggingHistory) -> int:
+        if len(hand) == 1:
+            return hand[0]
+        played, theirs = previousCards.played_by(player), previousCards.played_by(1 - player)
+        kept, discarded, cutCard = self.turns.get(player, (hand, [], None))
+        remaining = [c for c in kept if c not in played]
+        if not all(c in remaining for c in hand):
+            # Nothing was observed for this hand, so only the options are known
+            remaining, discarded, cutCard = hand, [], None
+        known = set(remaining) | set(discarded) | set(played) | set(theirs) | {cutCard}
+        hidden = 4 - len(theirs)
+
+        deals = self.determinizations(tuple(sorted(c for c in known if c is not None)), hidden)
+        seed = random.getrandbits(64)
+        results = self._search(search_pegging, remaining, player, list(previousCards.sequence()), seed, deals)
+        visits = {c: sum(r[c][0] for r in results if c in r) for c in hand}
+        return max(hand, key=lambda c: visits[c])
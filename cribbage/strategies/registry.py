@@ -0,0 +1,73 @@
+from collections.abc import Mapping
+from importlib import import_module
+from typing import Callable, Dict, Iterator
+
+# Third-party packages register strategies under this entry point group,
+# e.g. entry_points={"cribbage.strategies": ["mine = my_package:MyStrategy"]}
+ENTRY_POINT_GROUP = 'cribbage.strategies'
+
+def _entry_points(group: str) -> list:
+    from importlib.metadata import entry_points
+    found = entry_points()
+    if hasattr(found, 'select'):
+        return list(found.select(group=group))
+    return list(found.get(group, ()))
+
+class StrategyRegistry(Mapping):
+    """
+    StrategyRegistry maps names to strategy instances, like a dict, but only
+    imports and creates each strategy the first time it's looked up. Built-in
+    strategies are given as a class name from cribbage.strategies followed
+    by any arguments. Entry points in the cribbage.strategies group add
+    strategies from other packages: each names a Strategy class (or any
+    callable returning a strategy) that's called with no arguments. Names
+    are known without importing anything, so listing them is cheap.
+    """
+    def __init__(self, builtin: Dict[str, tuple], group: str = ENTRY_POINT_GROUP):
+        self.builtin = builtin
+        self.group = group
+        self.instances = {}
+        self._plugins = None
+
+    def plugins(self) -> dict:
+        """
+        The entry points of installed plugins by name. Plugins can't replace
+        built-in strategies.
+        """
+        if self._plugins is None:
+            self._plugins = {
+                entry_point.name: entry_point for entry_point in _entry_points(self.group)
+                if entry_point.name not in self.builtin
+            }
+        return self._plugins
+
+    def factory(self, name: str) -> Callable:
+        """
+        Returns the class (or callable) that creates the named strategy,
+        importing it if needed, and the arguments it's called with.
+        """
+        if name in self.builtin:
+            class_name, *args = self.builtin[name]
+            return getattr(import_module('cribbage.strategies'), class_name), args
+        if name in self.plugins():
+            return self.plugins()[name].load(), []
+        raise KeyError(name)
+
+    def describe(self, name: str) -> str:
+        return self.factory(name)[0].__doc__
+
+    def __getitem__(self, name: str):
+        if name not in self.instances:
+            factory, args = self.factory(name)
+            self.instances[name] = factory(*args)
+        return self.instances[name]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.builtin
+        yield from self.plugins()
+
+    def __len__(self) -> int:
+        return len(self.builtin) + len(self.plugins())
+
+    def __contains__(self, name) -> bool:
+        return name in self.builtin or name in self.plugins()
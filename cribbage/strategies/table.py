@@ -0,0 +1,39 @@
+from cribbage.strategies import FirstStrategy, ExpectedValue
+from cribbage.tables import CribTable, DecisionTable, table_path
+
+from typing import List
+
+class TableStrategy(FirstStrategy):
+    """
+    TableStrategy chooses hands with a single lookup in a decision table
+    built from another strategy by build-decision-table. The table is read
+    from {strategy}_decisions.npy in CRIBBAGE_TABLE_DIR (default ~/.cribbage)
+    the first time it's needed. It pegs like FirstStrategy.
+    Decisions are looked up by canonical deal, so they're suit invariant.
+    """
+    suit_invariant = True
+
+    def __init__(self, strategy: str):
+        self.strategy = strategy
+        self.table = None
+
+    def chooseHand(self, options: List[int], crib: bool) -> List[int]:
+        if self.table is None:
+            self.table = DecisionTable.load(table_path(f'{self.strategy}_decisions.npy'))
+        return self.table.chooseHand(options, crib)
+
+class CribExpectedValue(ExpectedValue):
+    """
+    CribExpectedValue adds the expected points its discards bring to its own
+    crib to the expected value of the hand, or subtracts them when the crib
+    belongs to the opponent. The crib points come from crib_table.npy, built
+    by build-crib-table, in CRIBBAGE_TABLE_DIR (default ~/.cribbage).
+    """
+    def __init__(self):
+        self.table = None
+
+    def score(self, hand: List[int], discarded: List[int], crib: bool) -> float:
+        if self.table is None:
+            self.table = CribTable.load(table_path('crib_table.npy'))
+        crib_points = self.table.expected(discarded, crib)
+        return super().score(hand, discarded, crib) + (crib_points if crib else -crib_points)
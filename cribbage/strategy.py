@@ -8,7 +8,15 @@ class Strategy:
     method is the pegging function, peg, which takes a hand and the sequence of
     previously played cards and returns a card to play next. 
     Besides that, anything goes!
+    Strategies that need a person at the keyboard set interactive, which
+    keeps them out of tournaments. Strategies whose hand choices don't
+    depend on how the suits are labelled (even when breaking ties) set
+    suit_invariant, which lets exactHandChoice play one deal per canonical
+    form instead of every deal.
     """
+    interactive = False
+    suit_invariant = False
+
     def chooseHand(self, options: List[int], crib: bool) -> List[int]:
         """
         chooseHand expects an array of integers with length 6 that represents
@@ -20,6 +28,15 @@ class Strategy:
         """
         pass
 
+    def observeTurn(self, player: int, hand: List[int], discarded: List[int], cutCard: int):
+        """
+        observeTurn is called once the cut card is revealed, with the player
+        number the strategy is playing as, the hand it kept and the cards it
+        discarded. The same strategy object may play both players, so anything
+        remembered should be kept by player. It does nothing by default.
+        """
+        pass
+
     def peg(self, hand: List[int], player: int, previousCards: List[List[Tuple[int]]]) -> int:
         """
         peg takes a hand and a set of previous cards that were played. Peg will
@@ -29,5 +46,8 @@ class Strategy:
         of previously played cards, grouped by 31s (each time 31 is reached, a
         new list is added). Each tuple is a pair containing a card and a player
         number.
+        previousCards is actually a PeggingHistory, which also offers views of
+        the current sequence, its total, each player's cards and the count of
+        each rank played without walking the lists.
         """
         pass
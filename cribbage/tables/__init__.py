@@ -0,0 +1,11 @@
+import os
+
+# Where table-backed strategies look for their tables
+TABLE_DIR = os.environ.get('CRIBBAGE_TABLE_DIR', os.path.join(os.path.expanduser('~'), '.cribbage'))
+
+def table_path(name: str) -> str:
+    return os.path.join(TABLE_DIR, name)
+
+from .score import ScoreTable, build_score_table
+from .decision import DecisionTable, build_decision_table
+from .crib import CribTable, build_crib_table
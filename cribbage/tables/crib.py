@@ -0,0 +1,105 @@
+from cribbage.strategy import Strategy
+from cribbage.score import scoreHandBatch, card, suit
+from cribbage.deck import RandomDeck
+from itertools import combinations
+from random import Random
+from typing import List
+import numpy as np
+
+PAIRS = 169
+
+def pair_index(c1: int, c2: int) -> int:
+    """
+    Returns the class of a pair of discards in a 13 x 13 grid of ranks:
+    suited pairs above the diagonal, offsuit pairs below and pairs of the
+    same rank on it. Only the class matters for the crib's expected value.
+    """
+    r1, r2 = sorted((card(c1), card(c2)))
+    if suit(c1) == suit(c2):
+        return r1 * 13 + r2
+    return r2 * 13 + r1
+
+def _representative(index: int) -> List[int]:
+    # A pair of cards from the given class
+    row, column = divmod(index, 13)
+    if row < column:
+        return [row, column]
+    return [column, row + 13]
+
+def _class_weights(pairs: List[List[int]]) -> np.ndarray:
+    weights = np.bincount([pair_index(*pair) for pair in pairs], minlength=PAIRS).astype(float)
+    return weights / weights.sum()
+
+def _discard_weights(opponent: Strategy, samples: int, crib: bool, seed: int) -> np.ndarray:
+    # How often the opponent discards each class of pair
+    deck = RandomDeck(Random(seed))
+    pairs = []
+    for _ in range(samples):
+        options, _, _ = deck.deal()
+        hand = opponent.chooseHand(options, crib)
+        pairs.append([c for c in options if c not in hand])
+    return _class_weights(pairs)
+
+def crib_matrix() -> np.ndarray:
+    """
+    Returns the expected crib score for every pair of discard classes: one
+    from each player, averaged over the cards in each class and every cut.
+    The cards kept in each player's hand are not accounted for.
+    """
+    matrix = np.zeros((PAIRS, PAIRS))
+    for mine in range(PAIRS):
+        discarded = _representative(mine)
+        remaining = np.array([c for c in range(52) if c not in discarded])
+        theirs = np.array(list(combinations(remaining, 2)))
+
+        # Score each crib against every remaining card, then drop the cuts
+        # that are one of the opponent's discards
+        hands = np.repeat(np.column_stack((np.tile(discarded, (len(theirs), 1)), theirs)), len(remaining), axis=0)
+        cuts = np.tile(remaining, len(theirs))
+        valid = (cuts != hands[:, 2]) & (cuts != hands[:, 3])
+        scores = scoreHandBatch(hands, cuts, crib=True) * valid
+        scores = scores.reshape(len(theirs), -1).sum(axis=1) / (len(remaining) - 2)
+
+        classes = np.array([pair_index(*pair) for pair in theirs])
+        matrix[mine] = np.bincount(classes, scores, PAIRS) / np.maximum(np.bincount(classes, minlength=PAIRS), 1)
+    return matrix
+
+def build_crib_table(path: str, opponent: Strategy = None, samples: int = 10000, seed: int = 0) -> np.ndarray:
+    """
+    Builds a (2, 169) table of expected crib points for each class of
+    discarded pair. Row 1 is for the player's own crib and row 0 for the
+    opponent's crib, where the points go to the opponent. The opponent's
+    discards are weighted by how often opponent discards each class into
+    their own crib or the player's crib (estimated from samples deals), or
+    uniformly at random if no opponent is given.
+    """
+    matrix = crib_matrix()
+    if opponent is None:
+        uniform = _class_weights(list(combinations(range(52), 2)))
+        weights = [uniform, uniform]
+    else:
+        weights = [_discard_weights(opponent, samples, crib, seed) for crib in (True, False)]
+    table = np.stack([matrix @ w for w in weights]).astype(np.float32)
+    np.save(path, table)
+    return table
+
+class CribTable:
+    """
+    CribTable looks up the expected crib points of a pair of discards in a
+    table from build_crib_table.
+    """
+    def __init__(self, table: np.ndarray, path: str = None):
+        self.table = table
+        self.path = path
+
+    @classmethod
+    def load(cls, path: str) -> 'CribTable':
+        return cls(np.load(path, mmap_mode='r'), path)
+
+    def __reduce__(self):
+        if self.path is None:
+            return (CribTable, (np.asarray(self.table),))
+        return (CribTable.load, (self.path,))
+
+    def expected(self, discarded: List[int], crib: bool) -> float:
+        return float(self.table[1 if crib else 0, pair_index(*discarded)])
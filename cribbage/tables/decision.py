@@ -0,0 +1,87 @@
+from cribbage.strategy import Strategy
+from cribbage.canonical import canonical_deals, canonical_suits, relabel
+from itertools import combinations, islice
+from functools import partial
+from typing import Iterable, Iterator, List, Tuple
+from math import comb
+import numpy as np
+
+# Each entry packs the deal's combinatorial rank with the discarded pair for
+# each crib flag: rank * 256 + crib_choice * 16 + not_crib_choice.
+DISCARDS = list(combinations(range(6), 2))
+
+# Deals handed to each worker at a time when building a table
+CHUNK_SIZE = 5000
+
+def deal_index(cards: List[int]) -> int:
+    """
+    Returns the combinatorial rank of a set of cards, a unique integer
+    between 0 and C(52, len(cards)) - 1.
+    """
+    return sum(comb(c, i + 1) for i, c in enumerate(sorted(cards)))
+
+def _decide(strategy: Strategy, deals: List[Tuple[int]]) -> np.ndarray:
+    entries = np.zeros(len(deals), dtype=np.uint64)
+    for i, deal in enumerate(deals):
+        entry = deal_index(deal) * 256
+        for crib in (False, True):
+            hand = strategy.chooseHand(list(deal), crib)
+            discarded = tuple(j for j, c in enumerate(deal) if c not in hand)
+            entry += DISCARDS.index(discarded) << (4 * crib)
+        entries[i] = entry
+    return entries
+
+def _chunks(deals: Iterable[Tuple[int]]) -> Iterator[List[Tuple[int]]]:
+    deals = iter(deals)
+    while True:
+        chunk = list(islice(deals, CHUNK_SIZE))
+        if not chunk:
+            return
+        yield chunk
+
+def build_decision_table(strategy: Strategy, path: str, workers: int = 1, deals: Iterable[Tuple[int]] = None) -> np.ndarray:
+    """
+    Runs strategy.chooseHand on every canonical 6 card deal, with and without
+    the crib, across workers processes and saves the decisions to path as a
+    sorted .npy file. deals can restrict the table to some canonical deals.
+    """
+    # Imported here so that lookups don't pull in the simulation engine
+    from cribbage.simulate import run_shards
+
+    if deals is None:
+        deals = (deal for deal, _ in canonical_deals(6))
+    entries = list(run_shards(partial(_decide, strategy), _chunks(deals), workers))
+    table = np.sort(np.concatenate(entries)) if entries else np.zeros(0, dtype=np.uint64)
+    np.save(path, table)
+    return table
+
+class DecisionTable:
+    """
+    DecisionTable looks up the hand a strategy chose for a deal in a table
+    from build_decision_table. The deal is mapped to its canonical suits, the
+    decision is found by binary search and mapped back to the original cards.
+    """
+    def __init__(self, table: np.ndarray, path: str = None):
+        self.table = table
+        self.path = path
+
+    @classmethod
+    def load(cls, path: str) -> 'DecisionTable':
+        return cls(np.load(path, mmap_mode='r'), path)
+
+    def __reduce__(self):
+        if self.path is None:
+            return (DecisionTable, (np.asarray(self.table),))
+        return (DecisionTable.load, (self.path,))
+
+    def chooseHand(self, options: List[int], crib: bool) -> List[int]:
+        canonical = relabel(options, canonical_suits(options))
+        order = sorted(range(6), key=lambda i: canonical[i])
+        rank = deal_index(canonical)
+
+        position = np.searchsorted(self.table, np.uint64(rank * 256))
+        if position == len(self.table) or int(self.table[position]) >> 8 != rank:
+            raise KeyError(f"No decision for {options}")
+        choice = (int(self.table[position]) >> (4 * bool(crib))) & 15
+        discarded = {order[i] for i in DISCARDS[choice]}
+        return [c for i, c in enumerate(options) if i not in discarded]
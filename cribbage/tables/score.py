@@ -0,0 +1,96 @@
+from cribbage.score import pair, run, fifteen
+from itertools import combinations, combinations_with_replacement
+from typing import List
+from math import comb
+import numpy as np
+
+HANDS = comb(52, 4)
+
+# Binomial coefficients used to rank a sorted 4 card hand in the
+# combinatorial number system: C(a, 1) + C(b, 2) + C(c, 3) + C(d, 4).
+_BINOMIAL = [[comb(n, k) for n in range(52)] for k in range(5)]
+_BINOMIAL_ARRAY = np.array(_BINOMIAL, dtype=np.int64)
+
+def hand_index(hand: List[int]) -> int:
+    """
+    Returns the combinatorial rank of a 4 card hand, a unique integer between
+    0 and C(52, 4) - 1. The order of the cards doesn't matter.
+    """
+    a, b, c, d = sorted(hand)
+    return _BINOMIAL[1][a] + _BINOMIAL[2][b] + _BINOMIAL[3][c] + _BINOMIAL[4][d]
+
+def hand_index_batch(hands: np.ndarray) -> np.ndarray:
+    """
+    Vectorized hand_index for an (N, 4) array of hands.
+    """
+    hands = np.sort(hands, axis=1)
+    return sum(_BINOMIAL_ARRAY[k + 1][hands[:, k]] for k in range(4))
+
+def _rank_scores() -> np.ndarray:
+    """
+    Pairs, runs and fifteens only depend on the ranks of the five cards, so
+    they're scored once per sorted rank pattern. The result is indexed by the
+    sorted ranks read as a base 13 number.
+    """
+    scores = np.zeros(13 ** 5, dtype=np.uint8)
+    for ranks in combinations_with_replacement(range(13), 5):
+        hand, cutCard = list(ranks[:4]), ranks[4]
+        index = sum(r * 13 ** (4 - i) for i, r in enumerate(ranks))
+        scores[index] = pair(hand, cutCard) + run(hand, cutCard) + fifteen(hand, cutCard)
+    return scores
+
+def build_score_table(path: str) -> np.ndarray:
+    """
+    Scores every (4 card hand, cut card, crib) combination and saves the
+    result to path as a .npy file. The table has shape (2, C(52, 4), 52) and
+    is indexed by crib, hand_index(hand) and the cut card. Entries where the
+    cut card is part of the hand are left at 0.
+    """
+    hands = np.array(list(combinations(range(52), 4)), dtype=np.int64)
+    index = hand_index_batch(hands)
+    ranks, suits = hands % 13, hands // 13
+    same_suit = (suits == suits[:, :1]).all(axis=1)
+    rank_scores = _rank_scores()
+
+    table = np.zeros((2, HANDS, 52), dtype=np.uint8)
+    for cutCard in range(52):
+        cut_rank, cut_suit = cutCard % 13, cutCard // 13
+        full = np.sort(np.column_stack((ranks, np.full(len(hands), cut_rank))), axis=1)
+        base = rank_scores[full @ (13 ** np.arange(4, -1, -1))]
+        jack = ((ranks == 10) & (suits == cut_suit)).any(axis=1)
+        flush_cut = same_suit & (suits[:, 0] == cut_suit)
+        valid = ~(hands == cutCard).any(axis=1)
+
+        hand_score = base + jack + 4 * same_suit + flush_cut
+        crib_score = base + jack + 5 * flush_cut
+        table[0, index, cutCard] = np.where(valid, hand_score, 0)
+        table[1, index, cutCard] = np.where(valid, crib_score, 0)
+
+    np.save(path, table)
+    return table
+
+class ScoreTable:
+    """
+    ScoreTable answers scoreHand queries from a table produced by
+    build_score_table. Loading memory-maps the file, so processes that load
+    the same table share its pages instead of each holding a copy. Loaded
+    tables pickle as their path, so worker processes map the file again.
+    """
+    def __init__(self, table: np.ndarray, path: str = None):
+        self.table = table
+        self.path = path
+
+    @classmethod
+    def load(cls, path: str) -> 'ScoreTable':
+        return cls(np.load(path, mmap_mode='r'), path)
+
+    def __reduce__(self):
+        if self.path is None:
+            return (ScoreTable, (np.asarray(self.table),))
+        return (ScoreTable.load, (self.path,))
+
+    def score(self, hand: List[int], cutCard: int, crib: bool = False) -> int:
+        return int(self.table[1 if crib else 0, hand_index(hand), cutCard])
+
+    def scoreBatch(self, hands: np.ndarray, cuts: np.ndarray, crib: bool = False) -> np.ndarray:
+        return self.table[np.asarray(crib, dtype=np.int64), hand_index_batch(hands), cuts].astype(np.int64)
@@ -0,0 +1,98 @@
+from cribbage.strategies import strategies, FirstStrategy
+from cribbage.fast_game import fast_game
+from cribbage.simulate import seed_shard, run_shards, shards, new_seed, preserved_random_state, SHARD_SIZE
+from cribbage.constants import POINT_CAP
+from cribbage.logger import logger
+from itertools import combinations
+from functools import partial
+from typing import Dict, Iterable, List, Tuple
+import time
+import numpy as np
+import pandas as pd
+
+# A unit of work: two strategy names and a shard of games between them
+Unit = Tuple[str, str, Tuple[int, int]]
+
+def tournament_names() -> List[str]:
+    """
+    Returns the registered strategies that can play without a person.
+    """
+    return [name for name, strategy in strategies.items() if not strategy.interactive]
+
+def measure_costs(names: Iterable[str], games: int = 2, point_cap: int = POINT_CAP, seed: int = 0,
+                  skip_missing: bool = False) -> Dict[str, float]:
+    """
+    Times games of each strategy against FirstStrategy and returns the
+    seconds per game. This is the cost used to balance a tournament. With
+    skip_missing, strategies whose tables haven't been built are left out.
+    """
+    costs = {}
+    first = FirstStrategy()
+    with preserved_random_state():
+        for name in names:
+            deck = seed_shard(seed, 0, games)
+            start = time.perf_counter()
+            try:
+                for game_number in range(games):
+                    fast_game(strategies[name], first, game_number % 2, point_cap, deck.game(game_number))
+            except FileNotFoundError as e:
+                if not skip_missing:
+                    raise
+                logger.warning(f"Skipping {name}: {e}")
+                continue
+            costs[name] = (time.perf_counter() - start) / max(games, 1)
+    return costs
+
+def schedule(units: Iterable[Unit], costs: Dict[str, float]) -> List[Unit]:
+    """
+    Orders units longest first by their estimated time: the cost of both
+    strategies times the number of games. Handing the longest units out
+    first to whichever worker is free (LPT scheduling) keeps the slow
+    strategies from leaving one worker busy long after the others are done.
+    """
+    def _cost(unit: Unit) -> float:
+        name1, name2, (start, stop) = unit
+        return (costs[name1] + costs[name2]) * (stop - start)
+    return sorted(units, key=_cost, reverse=True)
+
+def _play_unit(point_cap: int, seed: int, unit: Unit) -> Tuple[str, str, int, int]:
+    name1, name2, (start, stop) = unit
+    deck = seed_shard(seed, start, stop)
+    strat1, strat2 = strategies[name1], strategies[name2]
+    wins = sum(
+        fast_game(strat1, strat2, game_number % 2, point_cap, deck.game(game_number)).strat1_winner
+        for game_number in range(start, stop)
+    )
+    return name1, name2, stop - start, wins
+
+def tournament(names: List[str] = None, games: int = 100, point_cap: int = POINT_CAP, workers: int = 1,
+               seed: int = None, shard_size: int = SHARD_SIZE, calibration: int = 2) -> pd.DataFrame:
+    """
+    Plays games between every pair of the named strategies (every
+    non-interactive strategy with its tables built by default) and returns the matrix of win rates
+    of each row's strategy against each column's. Every pairing's games are
+    split into shards which are scheduled across workers by the measured cost
+    of each strategy (calibration games against FirstStrategy). Shards are
+    seeded by position, so every pairing is dealt the same cards and the
+    results don't depend on the number of workers.
+    """
+    seed = new_seed() if seed is None else seed
+    costs = measure_costs(tournament_names() if names is None else names, calibration, point_cap, seed,
+                          skip_missing=names is None)
+    names = list(costs)
+    units = [(name1, name2, shard) for name1, name2 in combinations(names, 2) for shard in shards(games, shard_size)]
+
+    played = pd.DataFrame(0, index=names, columns=names)
+    wins = pd.DataFrame(0, index=names, columns=names)
+    # Units finish in any order, which lets the longest-first schedule keep
+    # every worker busy
+    results = run_shards(partial(_play_unit, point_cap, seed), schedule(units, costs), workers, ordered=False)
+    for name1, name2, count, won in results:
+        played.loc[name1, name2] += count
+        played.loc[name2, name1] += count
+        wins.loc[name1, name2] += won
+        wins.loc[name2, name1] += count - won
+
+    matrix = wins / played.replace(0, np.nan)
+    matrix['overall'] = wins.sum(axis=1) / played.sum(axis=1).replace(0, np.nan)
+    return matrix
@@ -17,7 +17,10 @@ setup(
         "Programming Language :: Python :: 3",
         "Operating System :: OS Independent",
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.8',
+    extras_require={
+        "parquet": ["pyarrow"],
+    },
     entry_points = {
         "console_scripts": ["cribbage=cribbage.main:main"]
     }
@@ -0,0 +1,84 @@
+from cribbage.analysis import analyze_game, GameAnalyzer, RunningStats, create_hand_histogram, HandHistogram, \
+    WinRateInterval, SPRT
+from cribbage.simulate import simulate, simulateChunks, simulateHandChoice, simulateHandChoiceChunks
+from cribbage.strategies import RandomStrategy
+from pandas.testing import assert_frame_equal
+import numpy as np
+import pandas as pd
+from cribbage.constants import WINNER
+
+def test_running_stats():
+    values = np.arange(20.0) ** 1.5
+    merged = RunningStats().update(values[:7]).merge(RunningStats().update(values[7:]))
+    assert(merged.count == 20)
+    assert(np.isclose(merged.result(), values.mean()))
+    assert(np.isclose(merged.variance(), values.var(ddof=1)))
+    assert(np.isnan(RunningStats().update([np.nan]).result()))
+
+def test_game_analyzer():
+    """
+    Analyzing chunk by chunk, or merging analyzers from separate shards,
+    should match analyzing the whole DataFrame.
+    """
+    strat1, strat2 = RandomStrategy(), RandomStrategy()
+    expected = analyze_game(simulate(strat1, strat2, 20, point_cap=60, seed=2, shard_size=6))
+
+    analyzer = GameAnalyzer()
+    for chunk in simulateChunks(strat1, strat2, 20, point_cap=60, seed=2, shard_size=6):
+        analyzer.update(chunk)
+    assert_frame_equal(analyzer.result(), expected)
+
+    merged = GameAnalyzer()
+    for chunk in simulateChunks(strat1, strat2, 20, point_cap=60, seed=2, shard_size=6):
+        merged.merge(GameAnalyzer().update(chunk))
+    assert_frame_equal(merged.result(), expected)
+
+def test_hand_histogram():
+    strat = RandomStrategy()
+    raw = simulateHandChoice(strat, 200, seed=4)
+    hist = create_hand_histogram(raw)
+    for section, data in (('total', raw), ('crib', raw[raw['crib'] == 1]), ('not-crib', raw[raw['crib'] == 0])):
+        counts = data['score'].value_counts()
+        assert(all(hist.loc[section, str(score)] == counts.get(score, 0) for score in range(30)))
+        assert(np.isclose(hist.loc[section, 'mean'], data['score'].mean()))
+        assert(np.isclose(hist.loc[section, 'stddev'], data['score'].std()))
+
+    streamed = HandHistogram()
+    for chunk in simulateHandChoiceChunks(strat, 200, seed=4, shard_size=64):
+        streamed.merge(HandHistogram().update(chunk))
+    assert_frame_equal(streamed.result(), create_hand_histogram(simulateHandChoice(strat, 200, seed=4, shard_size=64)))
+
+def test_weighted_hand_histogram():
+    raw = pd.DataFrame({'crib': [0, 0, 1], 'score': [4, 8, 4]})
+    weighted = HandHistogram().update(pd.DataFrame({**raw, 'weight': [3, 1, 2]}))
+    repeated = HandHistogram().update(raw.loc[[0, 0, 0, 1, 2, 2]])
+    assert_frame_equal(weighted.result(), repeated.result())
+
+def _wins(wins, games):
+    return pd.DataFrame({f'strat1_{WINNER}': [1] * wins + [0] * (games - wins)})
+
+def test_win_rate_interval():
+    rule = WinRateInterval(0.1)
+    rule.update(_wins(60, 100))
+    lower, upper = rule.interval()
+    assert(lower < 0.6 < upper and not rule.decided())
+    rule.update(_wins(600, 1000))
+    assert(rule.decided())
+    assert(rule.result()['games'] == 1100)
+
+def test_sprt():
+    rule = SPRT(0.6)
+    assert(not rule.update(_wins(6, 10)).decided())
+    assert(rule.update(_wins(70, 100)).decision() == 'p1')
+    assert(SPRT(0.6).update(_wins(50, 200)).decision() == 'p0')
+
+def test_paired_analysis():
+    strat1, strat2 = RandomStrategy(), RandomStrategy()
+    expected = analyze_game(simulate(strat1, strat2, 20, point_cap=60, seed=2, shard_size=6, duplicate=True))
+    assert(0 <= expected.loc['total', 'paired_win_rate'] <= 1)
+    assert(np.isnan(expected.loc['strat1_crib', 'paired_win_rate']))
+
+    analyzer = GameAnalyzer()
+    for chunk in simulateChunks(strat1, strat2, 20, point_cap=60, seed=2, shard_size=6, duplicate=True):
+        analyzer.merge(GameAnalyzer().update(chunk))
+    assert_frame_equal(analyzer.result(), expected)
@@ -0,0 +1,40 @@
+from cribbage.benchmark import benchmarks, run_benchmarks, compare, save_report, load_report, _bench_game
+from cribbage.strategies import BruteForce, strategies
+from cribbage.fast_game import fast_game
+
+def test_suite_covers_strategies():
+    names = benchmarks().keys()
+    assert('choose_hand.expected_value' in names and 'peg.first' in names)
+    assert('peg.human' not in names)
+    assert({'score_hand', 'score_peg', 'random_deck_deal', 'game', 'simulate'} <= set(names))
+
+def test_report_and_compare(tmp_path):
+    report = run_benchmarks(['score_*', 'peg.first'], repeat=1, min_time=0.01)
+    assert(set(report['results']) == {'score_hand', 'score_peg', 'peg.first'})
+    assert(all(result['ops_per_second'] > 0 for result in report['results'].values()))
+
+    path = tmp_path / 'benchmark.json'
+    save_report(report, path)
+    baseline = load_report(path)
+    assert(compare(report, baseline) == {})
+
+    baseline['results']['score_hand']['ops_per_second'] *= 2
+    regressions = compare(report, baseline, threshold=0.1)
+    assert(list(regressions) == ['score_hand'])
+    assert(abs(regressions['score_hand']['change'] + 0.5) < 1e-9)
+
+def test_strategy_benchmarks_start_cold():
+    # expected_value fills the cache maximize_floor shares
+    strategies['expected_value'].chooseHand([0, 1, 2, 3, 4, 5], True)
+    assert(len(BruteForce.cache))
+    run = benchmarks()['choose_hand.maximize_floor'][0]()
+    assert(len(BruteForce.cache) == 0)
+    run()
+    assert(BruteForce.cache.misses == 15)
+
+def test_game_benchmark_is_repeatable():
+    games = []
+    for _ in range(2):
+        run = _bench_game(fast_game)
+        games.append([run() for _ in range(3)])
+    assert(games[0] == games[1])
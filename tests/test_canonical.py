@@ -0,0 +1,41 @@
+from cribbage.canonical import canonical_key, canonical_suits, relabel
+from cribbage.cache import LRUCache
+from cribbage.score import scoreHand
+from cribbage.strategies import BruteForce, ExpectedValue
+from itertools import permutations
+from random import Random
+from statistics import mean
+
+def test_canonical_key():
+    rng = Random(0)
+    for _ in range(50):
+        cards = rng.sample(range(52), 6)
+        key = canonical_key(cards[:4], cards[4:])
+        for mapping in permutations(range(4)):
+            assert(canonical_key(relabel(cards[:4], mapping), relabel(cards[4:], mapping)) == key)
+        mapped = relabel(cards, canonical_suits(cards))
+        assert(canonical_key(mapped) == canonical_key(cards))
+    assert(canonical_key([0, 1, 2, 3], [4, 5]) != canonical_key([0, 1, 2, 3], [4, 18]))
+
+def test_lru_cache():
+    cache = LRUCache(2)
+    assert(cache.get('a', lambda: 1) == 1)
+    assert(cache.get('b', lambda: 2) == 2)
+    assert(cache.get('a', lambda: 3) == 1)
+    assert(cache.get('c', lambda: 4) == 4)
+    assert(cache.get('b', lambda: 5) == 5)
+    assert((cache.hits, cache.misses, len(cache)) == (1, 4, 2))
+
+def test_brute_force_cache():
+    """
+    A hand that only differs by suit should hit the cache and still get the
+    same expected value as scoring every cut directly.
+    """
+    BruteForce.cache.clear()
+    strategy = ExpectedValue()
+    hand, discarded = [0, 14, 28, 42], [5, 6]
+    for mapping in ((0, 1, 2, 3), (3, 2, 1, 0)):
+        h, d = relabel(hand, mapping), relabel(discarded, mapping)
+        expected = mean(scoreHand(h, c) for c in range(52) if c not in h + d)
+        assert(strategy.score(h, d, False) == expected)
+    assert((BruteForce.cache.hits, BruteForce.cache.misses) == (1, 1))
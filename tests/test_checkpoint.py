@@ -0,0 +1,41 @@
+from cribbage.checkpoint import Checkpoint
+from pandas.testing import assert_frame_equal
+import pandas as pd
+import pytest
+
+def test_resume(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / 'checkpoint'))
+    with pytest.raises(FileNotFoundError):
+        checkpoint.resume({'seed': None})
+
+    checkpoint.start({'strategy1': 'random', 'seed': 5})
+    # A seed that wasn't given comes from the checkpoint
+    assert(checkpoint.resume({'strategy1': 'random', 'seed': None})['seed'] == 5)
+    with pytest.raises(ValueError):
+        checkpoint.resume({'strategy1': 'first', 'seed': None})
+    with pytest.raises(ValueError):
+        checkpoint.resume({'strategy1': 'random', 'seed': 6})
+
+def test_shards(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / 'checkpoint'))
+    checkpoint.start({})
+    chunk = pd.DataFrame({'turns': [3, 4], 'strat1_winner': [True, False]}, index=range(10, 12))
+    checkpoint.save((10, 12), chunk)
+    assert(checkpoint.completed() == {(10, 12)})
+    assert_frame_equal(checkpoint.load((10, 12)), chunk)
+
+    # Starting again clears the old shards
+    checkpoint.start({})
+    assert(checkpoint.completed() == set())
+    checkpoint.remove()
+    assert(not (tmp_path / 'checkpoint').exists())
+
+@pytest.mark.parametrize('flags, saves', [([], 0), (['--checkpoint'], 2)])
+def test_game_checkpoint_is_opt_in(tmp_path, monkeypatch, flags, saves):
+    from cribbage.main import main
+    saved = []
+    monkeypatch.setattr(Checkpoint, 'save', lambda self, shard, chunk: saved.append(shard))
+    monkeypatch.setattr('sys.argv', ['cribbage', '-i', '4', '-c', '2', '-s', '1', 'game', 'random', 'first', *flags, str(tmp_path)])
+    main()
+    assert(len(saved) == saves)
+    assert(not (tmp_path / 'checkpoint').exists())
@@ -0,0 +1,23 @@
+from cribbage.tables import CribTable
+from cribbage.tables.crib import pair_index, PAIRS
+from cribbage.strategies import CribExpectedValue, ExpectedValue
+import numpy as np
+
+def test_pair_index():
+    assert(len({pair_index(a, b) for a in range(52) for b in range(52) if a != b}) == PAIRS)
+    assert(pair_index(4, 17) == pair_index(30, 43))
+    assert(pair_index(3, 9) == pair_index(48, 42) != pair_index(3, 22))
+
+def test_crib_expected_value():
+    """
+    With a table that only values a pair of fives, the strategy should keep
+    them out of its hand for its own crib and hold them otherwise.
+    """
+    table = np.zeros((2, PAIRS), dtype=np.float32)
+    table[:, pair_index(4, 17)] = 100
+    strategy = CribExpectedValue()
+    strategy.table = CribTable(table)
+    options = [4, 17, 9, 22, 33, 50]
+    assert(sorted(strategy.chooseHand(options, True)) == [9, 22, 33, 50])
+    assert(4 in strategy.chooseHand(options, False) and 17 in strategy.chooseHand(options, False))
+    assert(strategy.score([9, 22, 33, 50], [4, 17], True) == ExpectedValue().score([9, 22, 33, 50], [4, 17], True) + 100)
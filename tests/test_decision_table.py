@@ -0,0 +1,35 @@
+from cribbage.canonical import canonical_deals, canonical_suits, relabel
+from cribbage.tables import DecisionTable, build_decision_table
+from cribbage.strategies import ExpectedValue
+from itertools import permutations
+from math import comb
+from random import Random
+
+def test_canonical_deals():
+    for n in (2, 3):
+        deals = list(canonical_deals(n))
+        assert(sum(multiplicity for _, multiplicity in deals) == comb(52, n))
+        assert(all(tuple(sorted(relabel(deal, canonical_suits(deal)))) == deal for deal, _ in deals))
+
+def test_decision_table(tmp_path):
+    """
+    Looking up any relabeling of a deal should give a hand that's as good as
+    the one the strategy picks.
+    """
+    strategy = ExpectedValue()
+    rng = Random(1)
+    deals = [rng.sample(range(52), 6) for _ in range(20)]
+    canonical = {tuple(sorted(relabel(deal, canonical_suits(deal)))) for deal in deals}
+    build_decision_table(strategy, tmp_path / 'decisions.npy', deals=sorted(canonical))
+    table = DecisionTable.load(tmp_path / 'decisions.npy')
+
+    def _value(options, hand, crib):
+        return strategy.score(hand, [c for c in options if c not in hand], crib)
+
+    for deal in deals:
+        for mapping in list(permutations(range(4)))[::5]:
+            options = relabel(deal, mapping)
+            for crib in (False, True):
+                hand = table.chooseHand(options, crib)
+                assert(len(hand) == 4 and all(c in options for c in hand))
+                assert(_value(options, hand, crib) == _value(options, strategy.chooseHand(options, crib), crib))
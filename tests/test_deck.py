@@ -0,0 +1,16 @@
+from cribbage.deck import BlockDeck
+
+def test_block_deck():
+    deck = BlockDeck(3, 10, 20, turns=4)
+    game = deck.game(12)
+    # Long games carry on past the block
+    deals = [game.deal() for _ in range(10)]
+    assert(all(len(set(hand1 + hand2 + [cut])) == 13 for hand1, hand2, cut in deals))
+    assert(len({cut for _, _, cut in deals}) > 1)
+
+    # Each game's deals are the same no matter what was dealt before
+    deck = BlockDeck(3, 10, 20, turns=4)
+    deck.game(11).deal()
+    again = deck.game(12)
+    assert([again.deal() for _ in range(10)] == deals)
+    assert(BlockDeck(4, 10, 20, turns=4).game(12).deal() != deals[0])
@@ -0,0 +1,44 @@
+from cribbage.strategies import Expectimax
+from cribbage.strategies.expectimax import relevant
+from cribbage.pegging import PeggingHistory
+from cribbage.fast_game import fast_game
+from cribbage.deck import RandomDeck
+from random import Random
+
+def test_relevant_sequence():
+    assert(relevant((1, 2, 3)) == (1, 2, 3))
+    assert(relevant((3, 4, 4)) == (4, 4))
+    assert(relevant((5, 5, 5)) == (5, 5, 5))
+    assert(relevant((1, 2, 1, 3)) == (2, 1, 3))
+
+def test_takes_fifteen():
+    strategy = Expectimax()
+    # Player 0 kept a 5, a 2, a 9 and an ace, and the opponent led a 10
+    hand = [4, 14, 8, 26]
+    strategy.observeTurn(0, hand, [30, 45], 51)
+    history = PeggingHistory()
+    history.add(9, 1)
+
+    assert(strategy.peg(hand, 0, history) == 4)
+    assert(len(strategy.table) > 0)
+
+def test_takes_trimmed_fifteen():
+    strategy = Expectimax()
+    # After 5, 3, 3 the 5 is trimmed off, but the count is still 11: the 4
+    # makes fifteen and the 9 makes nothing
+    history = PeggingHistory()
+    for c, p in ((4, 1), (2, 0), (28, 1)):
+        history.add(c, p)
+    assert(strategy.peg([21, 16, 25], 0, history) == 16)
+
+def test_observes_turns():
+    class Recording(Expectimax):
+        def observeTurn(self, player, hand, discarded, cutCard):
+            super().observeTurn(player, hand, discarded, cutCard)
+            assert(len(hand) == 4 and len(discarded) == 2)
+            assert(cutCard not in hand and cutCard not in discarded)
+            self.observed = player
+
+    strategies = Recording(), Recording()
+    fast_game(*strategies, 0, 121, RandomDeck(Random(0)))
+    assert([s.observed for s in strategies] == [0, 1])
@@ -0,0 +1,27 @@
+from cribbage.game import game
+from cribbage.fast_game import fast_game
+from cribbage.deck import RandomDeck
+from cribbage.strategies import RandomStrategy, ExpectedValue
+from cribbage.simulate import simulate
+from pandas.testing import assert_frame_equal
+from random import Random, seed
+
+def test_same_outcomes():
+    """
+    Given the same deals and random state, both engines should play out
+    exactly the same games.
+    """
+    strat1, strat2 = RandomStrategy(), ExpectedValue()
+    for game_number in range(5):
+        seed(game_number)
+        expected = game(strat1, strat2, game_number % 2, 121, RandomDeck(Random(game_number)))
+        seed(game_number)
+        result = fast_game(strat1, strat2, game_number % 2, 121, RandomDeck(Random(game_number)))
+        assert(result._asdict() == expected.to_dict())
+
+def test_simulate_fast():
+    strat1, strat2 = RandomStrategy(), RandomStrategy()
+    assert_frame_equal(
+        simulate(strat1, strat2, 10, point_cap=60, seed=3),
+        simulate(strat1, strat2, 10, point_cap=60, seed=3, fast=True)
+    )
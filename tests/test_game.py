@@ -1,4 +1,6 @@
-from cribbage.game import peg, GameContext
+from cribbage.game import peg, GameContext, PeggingContext
+from cribbage.score import scorePeg
+from random import Random
 from cribbage.constants import PEG_POINTS
 from cribbage.strategies import FirstStrategy
 from cribbage.deck import RandomDeck
@@ -54,3 +56,25 @@ def test_peg_3():
     ## 2 ## 8    ## 15    ## 2 + 1
     pegging_setup([[10, 11, 4, 6], [12, 25, 9, 7]], [6, 4])
     pegging_setup([[10, 11, 4, 6], [12, 25, 9, 7]], [4, 0], 4)
+
+def test_incremental_peg_score():
+    """
+    The score kept by PeggingContext should match scorePeg for every play of
+    random sequences of cards.
+    """
+    rng = Random(0)
+    for _ in range(500):
+        pegging_context = PeggingContext(0)
+        for card in rng.sample(range(52), 20):
+            if not pegging_context.can_play([card]):
+                pegging_context.reset()
+            pegging_context.add(card)
+            assert(pegging_context.score() == scorePeg(pegging_context.cards_played()))
+
+    # Runs and pairs that the random sequences are unlikely to hit
+    for cards in ([0, 5, 1, 4, 2, 3], [2, 15, 28, 41], [3, 1, 2, 2 + 13], [6, 5, 4, 3, 2]):
+        pegging_context = PeggingContext(0)
+        for card in cards:
+            pegging_context.add(card)
+            assert(pegging_context.score() == scorePeg(pegging_context.cards_played()))
+            pegging_context.switch_turn()
@@ -0,0 +1,33 @@
+from cribbage.hand import Hand, fifteens, pairs, runs
+from itertools import combinations
+from random import Random
+
+def test_hand():
+    hand = Hand([3, 16, 51])
+    assert(16 in hand and 4 not in hand)
+    assert(list(hand) == [3, 16, 51] and len(hand) == 3)
+    assert(hand.counts[3] == 2 and hand.counts[12] == 1)
+    assert(hand.with_card(4) == Hand([3, 4, 16, 51]))
+    assert(hand.without(16) == Hand([3, 51]))
+    assert(hand.without(16).counts == Hand([3, 51]).counts)
+    assert(hand.suit(1) == 1 << 3)
+    assert(not hand.flush() and Hand([13, 20, 25]).flush())
+
+def test_rank_scoring():
+    # Against scoring every combination of the five cards directly
+    rng = Random(2)
+    for _ in range(2000):
+        cards = rng.sample(range(52), 5)
+        ranks = [c % 13 for c in cards]
+        values = [min(rank + 1, 10) for rank in ranks]
+        counts = Hand(cards).counts
+        assert(fifteens(counts) == sum(
+            sum(values[i] for i in subset) == 15
+            for size in range(2, 6) for subset in combinations(range(5), size)
+        ))
+        assert(pairs(counts) == 2 * sum(ranks[i] == ranks[j] for i, j in combinations(range(5), 2)))
+        consecutive = lambda subset: all(b == a + 1 for a, b in zip(subset, subset[1:]))
+        longest = max((size for size in range(3, 6) for subset in combinations(sorted(ranks), size)
+                       if consecutive(subset)), default=0)
+        run_count = sum(consecutive(subset) for subset in combinations(sorted(ranks), longest)) if longest else 0
+        assert(runs(counts) == longest * run_count)
@@ -0,0 +1,66 @@
+from cribbage.strategies import ISMCTS
+from cribbage.strategies.ismcts import search_discards, _until
+from cribbage.pegging import PeggingHistory
+import random
+import time
+
+def test_keeps_four_fives():
+    strategy = ISMCTS(iterations=500)
+    # Four fives, a king and a two
+    assert(sorted(strategy.chooseHand([4, 17, 25, 30, 1, 43], True)) == [4, 17, 30, 43])
+
+def test_takes_fifteen():
+    strategy = ISMCTS(iterations=500)
+    hand = [4, 14, 8, 26]
+    strategy.observeTurn(0, hand, [30, 45], 51)
+    history = PeggingHistory()
+    history.add(9, 1)
+    assert(strategy.peg(hand, 0, history) == 4)
+
+def test_determinization_cache():
+    strategy = ISMCTS(iterations=100)
+    strategy.chooseHand([0, 14, 28, 3, 17, 31], False)
+    # The same hand with the suits relabeled is the same information set
+    strategy.chooseHand([13, 27, 41, 16, 30, 44], False)
+    assert(strategy.deals.hits == 1 and strategy.deals.misses == 1)
+
+def test_time_budget():
+    strategy = ISMCTS(iterations=None, time_budget=0.05)
+    start = time.perf_counter()
+    strategy.chooseHand([0, 14, 28, 3, 17, 31], False)
+    assert(time.perf_counter() - start < 0.5)
+
+def test_workers():
+    strategy = ISMCTS(iterations=200, workers=2)
+    hand = [4, 14, 8, 26]
+    strategy.observeTurn(0, hand, [30, 45], 51)
+    history = PeggingHistory()
+    history.add(9, 1)
+    assert(strategy.peg(hand, 0, history) == 4)
+    assert(len(strategy.chooseHand([4, 17, 25, 30, 1, 43], True)) == 4)
+
+def test_determinizations_are_seeded_by_information_set():
+    known = (0, 14, 28, 3, 17, 31)
+    cold = ISMCTS(iterations=100).determinizations(known, 3)
+    warm = ISMCTS(iterations=100)
+    warm.determinizations((1, 2, 3), 3)
+    state = random.getstate()
+    assert((warm.determinizations(known, 3) == cold).all())
+    # Dealing doesn't draw from the global random state, cached or not
+    assert(random.getstate() == state)
+    assert(not (ISMCTS(iterations=100, seed=1).determinizations(known, 3) == cold).all())
+
+def test_close():
+    strategy = ISMCTS(iterations=100, workers=2)
+    strategy.chooseHand([0, 14, 28, 3, 17, 31], False)
+    assert(strategy._executor is not None)
+    strategy.close()
+    assert(strategy._executor is None)
+
+def test_pool_start_counts_against_budget():
+    # A worker that starts after the deadline doesn't search at all
+    deals = ISMCTS().determinizations((0, 14, 28, 3, 17, 31), 3)
+    counts, _ = _until(time.time() - 1, search_discards, [0, 14, 28, 3, 17, 31], False, deals, float('inf'), 2.0)
+    assert(counts.sum() == 0)
+    counts, _ = _until(None, search_discards, [0, 14, 28, 3, 17, 31], False, deals, 32, 2.0)
+    assert(counts.sum() == 32)
@@ -0,0 +1,51 @@
+from cribbage.game import peg, GameContext
+from cribbage.pegging import PeggingHistory
+from cribbage.strategies import FirstStrategy
+from cribbage.deck import RandomDeck
+
+def test_history_views():
+    history = PeggingHistory()
+    for card, player in ((10, 0), (4, 1), (23, 0), (5, 1)):
+        history.add(card, player)
+    history.reset()
+    history.add(3, 0)
+    history.add(16, 1)
+
+    assert(list(history.sequence()) == [3, 16])
+    assert(history.total == 8)
+    assert(list(history.played_by(0)) == [10, 23, 3])
+    assert(list(history.played_by(1)) == [4, 5, 16])
+    assert(history.rank_counts()[10] == 2 and history.rank_counts()[3] == 2)
+    assert(history.sequence().readonly)
+
+    # The old list of lists shape
+    assert(len(history) == 2)
+    assert(history[0] == [(10, 0), (4, 1), (23, 0), (5, 1)])
+    assert(history[-1] == [(3, 0), (16, 1)])
+    assert(list(history) == [history[0], history[1]])
+
+def test_history_grows():
+    history = PeggingHistory()
+    held = history.played_by(0)
+    for card in range(20):
+        history.add(card, 0)
+    assert(list(history.played_by(0)) == list(range(20)))
+    assert(history[0] == [(card, 0) for card in range(20)])
+    # A view taken before the buffers grew still works
+    assert(len(held) == 0)
+
+class RecordingStrategy(FirstStrategy):
+    def __init__(self):
+        self.seen = []
+
+    def peg(self, hand, player, previousCards):
+        self.seen.append([list(play) for play in previousCards])
+        return hand[0]
+
+def test_strategies_see_history():
+    strategy = RecordingStrategy()
+    gc = GameContext(1, 121, RandomDeck())
+    peg(gc, [strategy, strategy], [[10, 23, 3, 4], [4 + 13, 5, 18, 2]])
+    assert(strategy.seen[0] == [[]])
+    assert(strategy.seen[3] == [[(10, 0), (17, 1), (23, 0)]])
+    assert(strategy.seen[4] == [[(10, 0), (17, 1), (23, 0), (5, 1)], []])
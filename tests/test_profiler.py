@@ -0,0 +1,37 @@
+from cribbage.profiler import Profiler
+from cribbage.simulate import simulate
+from cribbage.strategies import RandomStrategy
+from cribbage.fast_game import fast_game
+from cribbage.deck import BlockDeck
+from pandas.testing import assert_frame_equal
+
+def test_profiled_simulation():
+    """
+    Profiling records every phase without changing the games.
+    """
+    strat1, strat2 = RandomStrategy(), RandomStrategy()
+    for fast in (False, True):
+        profiler = Profiler()
+        profiled = simulate(strat1, strat2, 6, point_cap=60, seed=1, shard_size=3, fast=fast, profiler=profiler)
+        assert_frame_equal(profiled, simulate(strat1, strat2, 6, point_cap=60, seed=1, shard_size=3, fast=fast))
+
+        report = profiler.report()
+        assert(report.loc['game', 'calls'] == 6 and report.loc['results', 'calls'] == 6)
+        assert(report.loc['deal', 'calls'] == report.loc['choose_hand.strat1', 'calls'])
+        for phase in ('peg.strat1', 'peg.strat2', 'peg_scoring', 'hand_scoring', 'crib_scoring', 'engine'):
+            assert(report.loc[phase, 'calls'] > 0)
+        assert(report.loc['hand_scoring', 'calls'] == 2 * report.loc['crib_scoring', 'calls'])
+
+        latencies = profiler.latency_report()
+        assert(latencies.loc['peg.strat2'].sum() == report.loc['peg.strat2', 'calls'])
+
+
+def test_engine_phases():
+    # Each turn that gets to the show scores two hands and one crib, whatever
+    # crib flag the hands are scored with
+    profiler = Profiler()
+    result = fast_game(RandomStrategy(), RandomStrategy(), 0, 121, BlockDeck(3).game(0), profiler=profiler)
+    report = profiler.report()
+    assert(report.loc['crib_scoring', 'calls'] in (result.turns, result.turns - 1))
+    assert(report.loc['hand_scoring', 'calls'] == 2 * report.loc['crib_scoring', 'calls'])
+    assert(report.loc['results', 'calls'] == 1)
@@ -0,0 +1,52 @@
+from cribbage.strategies import strategies, StrategyRegistry
+from cribbage.strategies import registry
+from cribbage.strategy import Strategy
+from importlib.metadata import EntryPoint
+import subprocess
+import sys
+
+class PluginStrategy(Strategy):
+    """
+    PluginStrategy stands in for a strategy from another package.
+    """
+
+def test_lazy_registry():
+    result = subprocess.run([sys.executable, '-c', '\n'.join((
+        'import sys',
+        'from cribbage.strategies import strategies',
+        'assert "expected_value" in strategies',
+        'assert "cribbage.strategies.brute_force" not in sys.modules',
+        'strategies["expected_value"]',
+        'assert "cribbage.strategies.brute_force" in sys.modules',
+        'assert "cribbage.strategies.ismcts" not in sys.modules',
+    ))], capture_output=True)
+    assert(result.returncode == 0)
+
+def test_cli_startup_imports():
+    result = subprocess.run([sys.executable, '-c', '\n'.join((
+        'import sys',
+        'import cribbage.main',
+        'assert "pandas" not in sys.modules',
+        'assert "numpy" not in sys.modules',
+    ))], capture_output=True)
+    assert(result.returncode == 0)
+
+def test_registry_instances():
+    assert(strategies['first'] is strategies['first'])
+    assert(type(strategies['expected_value_table']).__name__ == 'TableStrategy')
+    assert(strategies['expected_value_table'].strategy == 'expected_value')
+    assert('FirstStrategy' in strategies.describe('first'))
+
+def test_plugins(monkeypatch):
+    plugins = [
+        EntryPoint('plugin', f'{__name__}:PluginStrategy', registry.ENTRY_POINT_GROUP),
+        EntryPoint('first', f'{__name__}:PluginStrategy', registry.ENTRY_POINT_GROUP),
+    ]
+    monkeypatch.setattr(registry, '_entry_points', lambda group: plugins)
+    plugin_registry = StrategyRegistry({'first': ('FirstStrategy',)})
+    assert(list(plugin_registry) == ['first', 'plugin'])
+    assert(len(plugin_registry) == 2)
+    assert(isinstance(plugin_registry['plugin'], PluginStrategy))
+    # Plugins can't replace built-in strategies
+    assert(type(plugin_registry['first']).__name__ == 'FirstStrategy')
+    assert('another package' in plugin_registry.describe('plugin'))
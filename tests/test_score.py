@@ -1,4 +1,5 @@
-from cribbage.score import scoreHand, scorePeg
+from cribbage.score import scoreHand, scoreHandBatch, scorePeg
+from random import Random
 
 def test_best_hand():
     assert(scoreHand([4, 30, 17, 36], 43) == 28)
@@ -34,6 +35,9 @@ def test_pegging_pairs():
     assert(scorePeg([2, 2 + 13]) == 2)
     assert(scorePeg([2, 2 + 13, 2 + 26]) == 6)
     assert(scorePeg([2, 2 + 13, 2 + 26, 2 + 39]) == 12)
+    # The total counts cards that aren't in the list
+    assert(scorePeg([1, 1 + 13, 0], 15) == 2)
+    assert(scorePeg([2, 2 + 13, 8], 20) == 0)
     assert(scorePeg([2, 1 + 13, 2 + 13]) == 0)
 
 def test_pegging_fifteens():
@@ -49,3 +53,15 @@ def test_pegging_runs():
     assert(scorePeg([7, 6, 5]) == 3)
     assert(scorePeg([5, 6, 7]) == 3)
     assert(scorePeg([0, 5, 1, 4, 2, 3]) == 6)
+
+def test_score_batch():
+    hands = [[4, 30, 17, 36], [10, 23, 48, 50], [1, 3, 5, 7], [1, 3, 5, 7], [45, 46, 32, 33], [1, 14, 27, 40]]
+    cuts = [43, 37, 22, 9, 21, 48]
+    assert(list(scoreHandBatch(hands, cuts)) == [28, 16, 4, 5, 24, 12])
+    assert(list(scoreHandBatch(hands[2:4], cuts[2:4], crib=True)) == [0, 5])
+
+    rng = Random(0)
+    deals = [rng.sample(range(52), 5) for _ in range(5000)]
+    crib = [rng.random() < 0.5 for _ in deals]
+    expected = [scoreHand(d[:4], d[4], c) for d, c in zip(deals, crib)]
+    assert(list(scoreHandBatch([d[:4] for d in deals], [d[4] for d in deals], crib)) == expected)
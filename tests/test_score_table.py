@@ -0,0 +1,27 @@
+from cribbage.score import scoreHand, scoreHandBatch, useScoreTable
+from cribbage.tables import ScoreTable, build_score_table
+from random import Random
+
+def test_score_table(tmp_path):
+    """
+    Builds the full table and checks it against the scoring functions on a
+    sample of random hands, both directly and through scoreHand.
+    """
+    path = tmp_path / 'score_table.npy'
+    build_score_table(path)
+    table = ScoreTable.load(path)
+
+    rng = Random(0)
+    for _ in range(2000):
+        cards = rng.sample(range(52), 5)
+        crib = rng.random() < 0.5
+        assert(table.score(cards[:4], cards[4], crib) == scoreHand(cards[:4], cards[4], crib))
+
+    useScoreTable(table)
+    try:
+        assert(scoreHand([4, 43, 17, 36], 30) == 29)
+        assert(scoreHand([1, 3, 5, 7], 22) == 4)
+        assert(scoreHand([1, 3, 5, 7], 22, crib=True) == 0)
+        assert(list(scoreHandBatch([[1, 3, 5, 7], [1, 3, 5, 7]], [22, 9], [True, True])) == [0, 5])
+    finally:
+        useScoreTable(None)
@@ -0,0 +1,99 @@
+from cribbage.server import GameServer, StrategySeat, async_game
+from cribbage.strategies import FirstStrategy, MaximizeFloor
+from cribbage.fast_game import fast_game
+from cribbage.deck import BlockDeck
+from functools import partial
+import cribbage.tables
+import asyncio
+import logging
+
+def test_async_game():
+    # The same decisions on the same deals give the same game as fast_game
+    deck = BlockDeck(4, 0, 3)
+    for n in range(3):
+        seats = StrategySeat(MaximizeFloor()), StrategySeat(FirstStrategy())
+        result = asyncio.run(async_game(*seats, n % 2, 121, deck.game(n)))
+        assert(result == fast_game(MaximizeFloor(), FirstStrategy(), n % 2, 121, deck.game(n)))
+
+async def _client(port: int, strategy: str, quit_after: int = None) -> list:
+    # Always discards the first two cards and plays the first card it can
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    lines = []
+    while True:
+        line = (await reader.readline()).decode().strip()
+        if not line:
+            break
+        lines.append(line)
+        if quit_after is not None and len(lines) >= quit_after:
+            break
+        keyword = line.split()[0]
+        if keyword == 'STRATEGY':
+            # A bad reply first, which should be asked again
+            writer.write(b'nonsense\n' if 'ERROR' not in lines[-2] else f'{strategy}\n'.encode())
+        elif keyword == 'DISCARD':
+            writer.write(b'0 1\n')
+        elif keyword == 'PEG':
+            # Out of range first, which should be asked again
+            writer.write(b'-1\n' if 'ERROR' not in lines[-2] else b'0\n')
+    writer.close()
+    return lines
+
+def _serve(server: GameServer, *clients) -> list:
+    # Runs each client coroutine function against the server on a free port
+    async def _run():
+        listener = await asyncio.start_server(server.handle, '127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            games = await asyncio.gather(*(client(port) for client in clients))
+            while server.games:
+                await asyncio.sleep(0.01)
+        return games
+    return asyncio.run(_run())
+
+def test_server():
+    results = []
+    server = GameServer(point_cap=61, on_result=lambda name, result: results.append((name, result)))
+    games = _serve(
+        server,
+        *(partial(_client, strategy=name) for name in ('first', 'random', 'maximize_floor')),
+        partial(_client, strategy='first', quit_after=6),
+    )
+    assert(sorted(name for name, _ in results) == ['first', 'maximize_floor', 'random'])
+    for lines in games[:3]:
+        assert(lines[0].startswith('WELCOME') and 'human' not in lines[0])
+        assert(lines[2].startswith('ERROR'))
+        winner, score1, score2 = lines[-1].split()[1:]
+        assert(lines[-1].startswith('GAMEOVER') and max(int(score1), int(score2)) == 61)
+    # The abandoned game didn't finish or take the server down
+    assert(not games[3][-1].startswith('GAMEOVER'))
+
+async def _long_reply(port: int) -> list:
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    await reader.readline()
+    await reader.readline()
+    writer.write(b'x' * 2 ** 17 + b'\n')
+    try:
+        # The server may reset the connection with the rest of the reply unread
+        return (await reader.read()).decode().splitlines()
+    except ConnectionResetError:
+        return []
+    finally:
+        writer.close()
+
+def test_unplayable(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(cribbage.tables, 'TABLE_DIR', str(tmp_path))
+    server = GameServer()
+    names = server.names()
+    assert('maximize_floor' in names and 'maximize_floor_table' not in names and 'crib_expected_value' not in names)
+
+    # A table that goes missing once the server is up ends that game
+    names.append('maximize_floor_table')
+    lines, = _serve(server, partial(_client, strategy='maximize_floor_table'))
+    assert(lines[-1].startswith('ERROR'))
+
+    # A reply over the stream limit ends the game, and the server carries on
+    with caplog.at_level(logging.INFO, logger='cribbage'):
+        lines, game = _serve(server, _long_reply, partial(_client, strategy='first'))
+    assert('too long' in caplog.text)
+    assert(lines in ([], ['ERROR reply too long']))
+    assert(game[-1].startswith('GAMEOVER'))
@@ -1,6 +1,18 @@
-from cribbage.strategies import RandomStrategy
-from cribbage.simulate import simulate
+from cribbage.strategies import RandomStrategy, FirstStrategy, ExpectedValue, MaximizeFloor
+from cribbage.simulate import simulate, simulateChunks, simulateHandChoice, exactHandChoice
+from cribbage.canonical import canonical_deals, canonical_suits, relabel
+from cribbage.score import scoreHand
+from cribbage import simulate as simulate_module
+from itertools import islice, permutations
+from cribbage.checkpoint import Checkpoint
+from cribbage.analysis import SPRT
+from pandas.testing import assert_frame_equal
 from cribbage.constants import TOTAL_POINTS
+from cribbage.logger import logger, setLogLevel
+import random
+import numpy as np
+import pandas as pd
+import pytest
 
 def test_end_to_end():
     """
@@ -18,3 +30,143 @@ def test_end_to_end():
     assert(len(df) == games)
     assert(df[f'strat1_{TOTAL_POINTS}'].max() <= point_cap)
     assert(df[f'strat2_{TOTAL_POINTS}'].max() <= point_cap)
+
+def test_seeded_shards():
+    """
+    The same seed should produce the same games whether shards run in this
+    process or across a pool of workers.
+    """
+    strat1 = RandomStrategy()
+    strat2 = RandomStrategy()
+    serial = simulate(strat1, strat2, 12, seed=7, shard_size=5)
+    parallel = simulate(strat1, strat2, 12, workers=3, seed=7, shard_size=5)
+    assert_frame_equal(serial, parallel)
+    assert(not serial.equals(simulate(strat1, strat2, 12, seed=8, shard_size=5)))
+
+    hands = simulateHandChoice(strat1, 12, seed=7, shard_size=5)
+    assert_frame_equal(hands, simulateHandChoice(strat1, 12, workers=2, seed=7, shard_size=5))
+
+def test_leaves_random_state():
+    random.seed(3)
+    state = random.getstate()
+    simulate(RandomStrategy(), RandomStrategy(), 4, seed=7, shard_size=2)
+    simulateHandChoice(RandomStrategy(), 4, seed=7, shard_size=2)
+    assert(random.getstate() == state)
+
+def test_common_random_numbers():
+    """
+    Different strategies given the same seed should be dealt the same cards.
+    """
+    random_hands = simulateHandChoice(RandomStrategy(), 12, seed=7, shard_size=5)
+    first_hands = simulateHandChoice(FirstStrategy(), 12, seed=7, shard_size=5)
+    assert((random_hands['cutCard'] == first_hands['cutCard']).all())
+    columns = [f'hand_{i+1}' for i in range(4)] + ['discarded_1', 'discarded_2']
+    assert((np.sort(random_hands[columns].values) == np.sort(first_hands[columns].values)).all())
+
+def test_stopping_rule():
+    """
+    A stopping rule ends the simulation early, after the same games however
+    many workers there are.
+    """
+    strat1 = ExpectedValue()
+    strat2 = RandomStrategy()
+    serial = simulate(strat1, strat2, 1000, seed=1, shard_size=10, fast=True, stop=SPRT(0.6))
+    assert(len(serial) < 1000 and len(serial) % 10 == 0)
+    parallel = simulate(strat1, strat2, 1000, workers=2, seed=1, shard_size=10, fast=True, stop=SPRT(0.6))
+    assert_frame_equal(serial, parallel)
+
+def test_duplicate():
+    """
+    In duplicate games, the second game of each pair replays the first with
+    the strategies in each other's seats. With two copies of a deterministic
+    strategy, it's the same game seen from the other side.
+    """
+    df = simulate(FirstStrategy(), FirstStrategy(), 8, seed=5, shard_size=4, duplicate=True)
+    assert(list(df['pair']) == [0, 0, 1, 1, 2, 2, 3, 3])
+    first, second = df.iloc[::2], df.iloc[1::2]
+    for column in df.columns:
+        if column.startswith('strat1_'):
+            other = column.replace('strat1_', 'strat2_')
+            assert(list(first[column]) == list(second[other]))
+            assert(list(first[other]) == list(second[column]))
+    assert(list(first['crib_start']) == [1 - c for c in second['crib_start']])
+
+def test_duplicate_needs_pairs(tmp_path, monkeypatch, capsys):
+    from cribbage.main import main
+    monkeypatch.setattr('sys.argv', ['cribbage', 'game', 'random', 'first', '--duplicate', str(tmp_path)])
+    with pytest.raises(SystemExit):
+        main()
+    assert('must be even' in capsys.readouterr().err)
+
+def test_resume(tmp_path):
+    uninterrupted = simulate(RandomStrategy(), FirstStrategy(), 10, seed=9, shard_size=3)
+
+    # Stop after two of the four shards, then resume from the checkpoint
+    checkpoint = Checkpoint(str(tmp_path / 'checkpoint'))
+    checkpoint.start({'seed': 9})
+    chunks = simulateChunks(RandomStrategy(), FirstStrategy(), 10, seed=9, shard_size=3, checkpoint=checkpoint)
+    next(chunks), next(chunks)
+    chunks.close()
+    assert(checkpoint.completed() == {(0, 3), (3, 6)})
+
+    resumed = simulateChunks(RandomStrategy(), FirstStrategy(), 10, seed=9, shard_size=3, checkpoint=checkpoint, workers=2)
+    assert_frame_equal(pd.concat(resumed), uninterrupted)
+    assert(checkpoint.completed() == {(0, 3), (3, 6), (6, 9), (9, 10)})
+
+def _enumerated_counts(strat, deals) -> dict:
+    # Plays every deal each canonical deal stands for
+    counts = {'crib': np.zeros(30, dtype=int), 'not-crib': np.zeros(30, dtype=int)}
+    for cards, multiplicity in deals:
+        relabeled = {tuple(sorted(c % 13 + 13 * p[c // 13] for c in cards)) for p in permutations(range(4))}
+        assert(len(relabeled) == multiplicity)
+        for deal in relabeled:
+            for crib, section in ((1, 'crib'), (0, 'not-crib')):
+                hand = strat.chooseHand(list(deal), crib)
+                for cut in set(range(52)) - set(deal):
+                    counts[section][scoreHand(hand, cut)] += 1
+    return counts
+
+def test_exact_hand_choice(monkeypatch):
+    # MaximizeFloor breaks ties by the order of the cards, so it can choose
+    # differently on relabeled deals and has to play all of them
+    deals = list(islice(canonical_deals(), 0, 4000, 40))
+    monkeypatch.setattr(simulate_module, 'canonical_deals', lambda: iter(deals))
+    strat = MaximizeFloor()
+    histogram = exactHandChoice(strat, shard_size=30)
+    counts = _enumerated_counts(strat, deals)
+    for section in counts:
+        assert((histogram.counts[section] == counts[section]).all())
+
+class CanonicalFloor(MaximizeFloor):
+    """
+    CanonicalFloor chooses on the canonical deal, like the table strategies.
+    """
+    suit_invariant = True
+
+    def chooseHand(self, options, crib):
+        mapping = canonical_suits(options)
+        inverse = [mapping.index(s) for s in range(4)]
+        return relabel(super().chooseHand(sorted(relabel(options, mapping)), crib), inverse)
+
+def test_exact_hand_choice_suit_invariant(monkeypatch):
+    # Suit invariant strategies only play the canonical deals
+    deals = list(islice(canonical_deals(), 0, 400, 40))
+    monkeypatch.setattr(simulate_module, 'canonical_deals', lambda: iter(deals))
+    strat = CanonicalFloor()
+    histogram = exactHandChoice(strat, shard_size=3)
+    counts = _enumerated_counts(strat, deals)
+    for section in counts:
+        assert((histogram.counts[section] == counts[section]).all())
+
+def _log_level(_):
+    return logger.level
+
+def test_workers_log_at_parent_level():
+    level = logger.level
+    try:
+        for on in (False, True):
+            setLogLevel(on)
+            for ordered in (True, False):
+                assert(set(simulate_module.run_shards(_log_level, range(2), 2, ordered)) == {logger.level})
+    finally:
+        logger.setLevel(level)
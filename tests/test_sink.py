@@ -0,0 +1,26 @@
+from cribbage.sink import CSVSink, ParquetSink
+from cribbage.simulate import simulate, simulateChunks
+from cribbage.strategies import RandomStrategy
+import pandas as pd
+import pytest
+
+def test_csv_sink(tmp_path):
+    """
+    Writing chunks one at a time should give the same file as writing the
+    whole DataFrame at the end.
+    """
+    strat1, strat2 = RandomStrategy(), RandomStrategy()
+    with CSVSink(tmp_path / 'chunked') as sink:
+        for chunk in simulateChunks(strat1, strat2, 7, seed=1, shard_size=3):
+            sink.write(chunk)
+    simulate(strat1, strat2, 7, seed=1, shard_size=3).to_csv(tmp_path / 'whole.csv')
+    assert((tmp_path / 'chunked.csv').read_text() == (tmp_path / 'whole.csv').read_text())
+
+def test_parquet_sink(tmp_path):
+    pytest.importorskip('pyarrow')
+    strat1, strat2 = RandomStrategy(), RandomStrategy()
+    with ParquetSink(tmp_path / 'chunked') as sink:
+        for chunk in simulateChunks(strat1, strat2, 7, seed=1, shard_size=3):
+            sink.write(chunk)
+    expected = simulate(strat1, strat2, 7, seed=1, shard_size=3)
+    pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / 'chunked.parquet'), expected, check_index_type=False)
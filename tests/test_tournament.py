@@ -0,0 +1,39 @@
+from cribbage.tournament import tournament, tournament_names, schedule
+from cribbage.simulate import run_shards
+import time
+import numpy as np
+
+def test_tournament_names():
+    names = tournament_names()
+    assert('human' not in names)
+    assert('random' in names and 'first' in names)
+
+def test_schedule():
+    units = [('random', 'first', (0, 10)), ('random', 'slow', (0, 5)), ('random', 'first', (10, 12))]
+    costs = {'random': 1, 'first': 1, 'slow': 10}
+    assert(schedule(units, costs) == [units[1], units[0], units[2]])
+
+def test_tournament():
+    names = ['random', 'first', 'maximize_floor']
+    matrix = tournament(names, games=6, seed=3, shard_size=4, calibration=1)
+    assert(list(matrix.index) == names)
+    assert(list(matrix.columns) == names + ['overall'])
+    rates = matrix[names].values
+    assert(np.isnan(np.diag(rates)).all())
+    off_diagonal = ~np.eye(len(names), dtype=bool)
+    assert(np.allclose((rates + rates.T)[off_diagonal], 1))
+
+    # Scheduling across workers doesn't change the games
+    parallel = tournament(names, games=6, workers=2, seed=3, shard_size=4, calibration=1)
+    assert(matrix.equals(parallel))
+
+def _sleep(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+def test_unordered_shards():
+    # A slow unit at the front doesn't hold up the others
+    work = [0.5] + [0.01] * 8
+    results = list(run_shards(_sleep, work, workers=2, ordered=False))
+    assert(sorted(results) == sorted(work))
+    assert(results[-1] == 0.5)